@@ -5,67 +5,167 @@ Creates synthetic activity logs for dates without detailed tracking.
 """
 
 import json
+import mmap
 import os
 import sys
-from datetime import datetime
 from pathlib import Path
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from operator import itemgetter
+
+try:
+    import orjson
+    json_loads = orjson.loads
+    json_dumps = orjson.dumps
+except ImportError:  # orjson is optional; the stdlib keeps the scripts zero-setup
+    json_loads = json.loads
+
+    def json_dumps(obj):
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode()
+
+from history_common import HISTORY_FILE, iter_history_lines, local_date_and_time
 
 # Paths
-HISTORY_FILE = Path.home() / ".claude" / "history.jsonl"
 LOGS_DIR = Path.home() / "Desktop" / "cc-config" / "logs"
+CHECKPOINT_FILE = LOGS_DIR / ".backfill.json"
+
+# History files above this size are parsed in parallel
+PARALLEL_PARSE_BYTES = 5_000_000
+
+
+def split_history(parts, start, end):
+    """Split history.jsonl[start:end] into up to `parts` byte ranges on line boundaries."""
+    with open(HISTORY_FILE, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return []
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            bounds = [start]
+            for i in range(1, parts):
+                nl = mm.find(b"\n", max(start + i * (end - start) // parts, bounds[-1]), end)
+                if nl == -1:
+                    break
+                if nl + 1 > bounds[-1]:
+                    bounds.append(nl + 1)
+            bounds.append(end)
+    return [(a, b) for a, b in zip(bounds, bounds[1:]) if a < b]
+
+
+def read_checkpoint():
+    """Return (byte offset, dates) of history.jsonl already backfilled by a previous run."""
+    try:
+        checkpoint = json_loads(CHECKPOINT_FILE.read_bytes())
+        return int(checkpoint["offset"]), set(checkpoint["dates"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return 0, set()
+
+
+def save_checkpoint(offset, dates):
+    """Checkpoint the backfilled offset and dates, atomically so a crash can't leave it half-written."""
+    tmp_file = CHECKPOINT_FILE.with_suffix(".tmp")
+    tmp_file.write_bytes(json_dumps({"offset": offset, "dates": sorted(dates)}))
+    os.replace(tmp_file, CHECKPOINT_FILE)
+
+
+def pending_range():
+    """Return (start, end, dates): the byte range of history.jsonl not yet backfilled.
+
+    history.jsonl is append-only, so a run resumes where the last one stopped;
+    dates are the days that history before start covers. end stops after the
+    last complete line; a half-written entry waits for the next run. The
+    checkpoint is ignored if the history shrank, it no longer sits on a line
+    boundary, or one of its days no longer has a log file, so that day is
+    backfilled again.
+    """
+    with open(HISTORY_FILE, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return 0, 0, set()
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            end = mm.rfind(b"\n") + 1
+            start, dates = read_checkpoint()
+            if not 0 < start <= end or mm[start - 1] != 0x0A:
+                return 0, end, set()
+    if not all((LOGS_DIR / f"{date_str}.jsonl").exists() for date_str in dates):
+        return 0, end, set()
+    return start, end, dates
+
+
+def parse_history_range(start=0, end=None):
+    """Parse one byte range of history.jsonl into synthetic log entries grouped by date.
+
+    Returns (entries_by_date, total_entries, errors) so worker processes can hand
+    their results back to be merged and reported by the parent.
+    """
+    entries_by_date = defaultdict(list)
+    total_entries = 0
+    errors = []
 
+    for line in iter_history_lines(start, end):
+        try:
+            entry = json_loads(line)
+            timestamp = entry.get("timestamp")
+            if not timestamp:
+                continue
 
-def parse_history():
-    """Parse history.jsonl and group by date."""
-    if not HISTORY_FILE.exists():
-        print(f"❌ History file not found: {HISTORY_FILE}")
-        return {}
+            # Convert timestamp (milliseconds) to local date/time
+            date_str, time_str = local_date_and_time(timestamp)
+
+            # Extract project from path
+            project_path = entry.get("project", "")
+            project_name = Path(project_path).name if project_path else "unknown"
+
+            # Get prompt display text
+            prompt_text = entry.get("display", "")
+
+            # Create synthetic log entry
+            log_entry = {
+                "ts": time_str,
+                "source": "backfill",
+                "action": "user_prompt",
+                "project": project_name,
+                "cwd": project_path,
+                "prompt": prompt_text[:200],  # Truncate long prompts
+                "description": "Session activity"
+            }
+
+            entries_by_date[date_str].append(log_entry)
+            total_entries += 1
+
+        except Exception as e:
+            errors.append(str(e))
+            continue
 
-    print(f"📚 Reading history from {HISTORY_FILE}")
+    return dict(entries_by_date), total_entries, errors
 
+
+def _parse_history_range(bounds):
+    return parse_history_range(*bounds)
+
+
+def parse_history(start, end):
+    """Parse history.jsonl[start:end] and group by date."""
+    if start:
+        print(f"📚 Reading new history from {HISTORY_FILE} (since byte {start})")
+    else:
+        print(f"📚 Reading history from {HISTORY_FILE}")
+
+    # Large ranges are parsed in pieces across worker processes;
+    # below the threshold process startup costs more than it saves
+    workers = os.cpu_count() or 1
+    if workers > 1 and end - start > PARALLEL_PARSE_BYTES:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_parse_history_range, split_history(workers, start, end)))
+    else:
+        results = [parse_history_range(start, end)]
+
+    # Merge in file order so each day keeps its original entry order
     entries_by_date = defaultdict(list)
     total_entries = 0
-
-    with open(HISTORY_FILE) as f:
-        for line in f:
-            if not line.strip():
-                continue
-            try:
-                entry = json.loads(line)
-                timestamp = entry.get("timestamp")
-                if not timestamp:
-                    continue
-
-                # Convert timestamp (milliseconds) to datetime
-                dt = datetime.fromtimestamp(timestamp / 1000)
-                date_str = dt.strftime("%Y-%m-%d")
-                time_str = dt.strftime("%H:%M")
-
-                # Extract project from path
-                project_path = entry.get("project", "")
-                project_name = Path(project_path).name if project_path else "unknown"
-
-                # Get prompt display text
-                prompt_text = entry.get("display", "")
-
-                # Create synthetic log entry
-                log_entry = {
-                    "ts": time_str,
-                    "source": "backfill",
-                    "action": "user_prompt",
-                    "project": project_name,
-                    "cwd": project_path,
-                    "prompt": prompt_text[:200],  # Truncate long prompts
-                    "description": "Session activity"
-                }
-
-                entries_by_date[date_str].append(log_entry)
-                total_entries += 1
-
-            except Exception as e:
-                print(f"⚠️  Skipping malformed entry: {e}")
-                continue
+    for chunk_by_date, chunk_total, errors in results:
+        for date_str, entries in chunk_by_date.items():
+            entries_by_date[date_str].extend(entries)
+        total_entries += chunk_total
+        for error in errors:
+            print(f"⚠️  Skipping malformed entry: {error}")
 
     print(f"✅ Parsed {total_entries} entries across {len(entries_by_date)} dates")
     return entries_by_date
@@ -86,10 +186,9 @@ def write_daily_logs(entries_by_date, force=False):
             skipped_files += 1
             continue
 
-        # Write entries to daily log file
-        with open(log_file, "w") as f:
-            for entry in sorted(entries, key=lambda e: e["ts"]):
-                f.write(json.dumps(entry) + "\n")
+        # Write the whole day in one buffer
+        with open(log_file, "wb") as f:
+            f.write(b"\n".join(map(json_dumps, sorted(entries, key=itemgetter("ts")))) + b"\n")
 
         new_files += 1
         print(f"  📝 Created {date_str}.jsonl ({len(entries)} entries)")
@@ -103,10 +202,21 @@ def main():
     print("\n🔄 Backfilling cc-config logs from Claude Code history\n")
     print("=" * 60)
 
-    # Parse history
-    entries_by_date = parse_history()
+    if not HISTORY_FILE.exists():
+        print(f"❌ History file not found: {HISTORY_FILE}")
+        print("\n❌ No history entries found to backfill")
+        return 1
+
+    # Parse only the history appended since the last run
+    start, end, dates = pending_range()
+    entries_by_date = parse_history(start, end)
+    dates.update(entries_by_date)
 
     if not entries_by_date:
+        if start:
+            save_checkpoint(end, dates)
+            print("\n✅ No new history since the last backfill")
+            return 0
         print("\n❌ No history entries found to backfill")
         return 1
 
@@ -118,10 +228,12 @@ def main():
     # Write logs
     print(f"\n💾 Writing daily log files to {LOGS_DIR}\n")
     write_daily_logs(entries_by_date)
+    save_checkpoint(end, dates)
 
     print("\n" + "=" * 60)
     print("✅ Backfill complete!")
-    print(f"\n💡 Tip: Run /summary-pick to browse all {len(all_dates)} days of history\n")
+    total_days = sum(1 for _ in LOGS_DIR.glob("*.jsonl"))
+    print(f"\n💡 Tip: Run /summary-pick to browse all {total_days} days of history\n")
 
     return 0
 
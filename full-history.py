@@ -3,75 +3,118 @@
 Complete Claude Code history - all days with activity.
 """
 
+import functools
 import json
+import re
+import sys
 from datetime import datetime, timedelta
 from pathlib import Path
-from collections import defaultdict
+from collections import Counter, defaultdict
 
-HISTORY_FILE = Path.home() / ".claude" / "history.jsonl"
+try:
+    from orjson import loads as json_loads
+except ImportError:  # orjson is optional; the stdlib keeps the scripts zero-setup
+    json_loads = json.loads
+
+from history_common import HISTORY_FILE, iter_history_lines, local_date_and_time
+
+# Raw-line marker of a history entry that is nothing but "/clear"
+CLEAR_NEEDLE = b'"display":"/clear"'
+
+# Checked in order: the first category with a keyword hit wins
+PROMPT_CATEGORIES = [
+    ("🔧 debug", re.compile(r"fix|bug|error|issue|broken|not working", re.I)),
+    ("🏗️ build", re.compile(r"add|create|build|implement|new feature", re.I)),
+    ("♻️ refactor", re.compile(r"refactor|clean|improve|optimize", re.I)),
+    ("🧪 test", re.compile(r"test|spec|coverage", re.I)),
+    ("📚 learn", re.compile(r"review|explain|understand|how does", re.I)),
+]
 
 def load_history():
     entries = []
-    with open(HISTORY_FILE) as f:
-        for line in f:
-            if line.strip():
-                try:
-                    entry = json.loads(line)
-                    if "timestamp" in entry:
-                        entries.append(entry)
-                except:
-                    pass
+    for line in iter_history_lines():
+        if CLEAR_NEEDLE in line:
+            continue  # bare /clear commands never reach a report; skip the decode
+        try:
+            entry = json_loads(line)
+            if "timestamp" in entry:
+                entries.append(entry)
+        except:
+            pass
     return entries
 
+# Path components that never name a project
+SKIP_PATH_PARTS = frozenset({'Users', 'home', 'Desktop', 'Documents', 'Projects', 'Code', 'dev', 's3nik', 'dev playground'})
+
+@functools.lru_cache(maxsize=None)
 def extract_project_name(path):
     if not path:
         return "unknown"
     parts = Path(path).parts
-    skip = {'Users', 'home', 'Desktop', 'Documents', 'Projects', 'Code', 'dev', 's3nik', 'dev playground'}
-    meaningful = [p for p in parts if p not in skip and not p.startswith('.')]
+    meaningful = [p for p in parts if p not in SKIP_PATH_PARTS and not p.startswith('.')]
     return meaningful[-1] if meaningful else Path(path).name
 
+# Short prompts ("continue", "yes", "commit this") repeat constantly;
+# each distinct text only needs the regex pass once
+@functools.lru_cache(maxsize=None)
 def analyze_prompt(text):
-    text_lower = text.lower() if text else ""
-    if any(x in text_lower for x in ['fix', 'bug', 'error', 'issue', 'broken', 'not working']):
-        return "🔧 debug"
-    elif any(x in text_lower for x in ['add', 'create', 'build', 'implement', 'new feature']):
-        return "🏗️ build"
-    elif any(x in text_lower for x in ['refactor', 'clean', 'improve', 'optimize']):
-        return "♻️ refactor"
-    elif any(x in text_lower for x in ['test', 'spec', 'coverage']):
-        return "🧪 test"
-    elif any(x in text_lower for x in ['review', 'explain', 'understand', 'how does']):
-        return "📚 learn"
-    elif '/clear' in text_lower or len(text_lower) < 10:
+    text = text or ""
+    for category, pattern in PROMPT_CATEGORIES:
+        if pattern.search(text):
+            return category
+    if '/clear' in text.lower() or len(text) < 10:
         return None
-    else:
-        return "💻 code"
+    return "💻 code"
+
+# Widest activity bar; each day slices it to its prompt count
+_BLOCKS = "█" * 30
+
+class ProjStats:
+    """Running aggregate of one project's prompts on one day."""
+
+    __slots__ = ("first", "last", "categories", "count", "samples")
+
+    def __init__(self):
+        self.first = None
+        self.last = None
+        self.categories = set()
+        self.count = 0
+        self.samples = []  # first two prompts, shown under the project
+
+    def add(self, time_str, prompt, category):
+        if self.first is None or time_str < self.first:
+            self.first = time_str
+        if self.last is None or time_str > self.last:
+            self.last = time_str
+        self.categories.add(category)
+        self.count += 1
+        if len(self.samples) < 2:
+            self.samples.append(prompt)
 
 def main():
+    # Render into one buffer and write it once instead of a print() per line
+    out = []
+    emit = out.append
+
     entries = load_history()
 
-    # Group by date
-    by_date = defaultdict(lambda: {"projects": defaultdict(list), "count": 0})
+    # Group by (date, project) in one flat dict, plus per-day prompt counts
+    by_day_proj = defaultdict(ProjStats)
+    day_count = Counter()
 
     for e in entries:
         ts = e.get("timestamp", 0)
         if ts:
-            dt = datetime.fromtimestamp(ts / 1000)
-            date_str = dt.strftime("%Y-%m-%d")
+            date_str, time_str = local_date_and_time(ts)
             project = extract_project_name(e.get("project", ""))
             prompt = e.get("display", "")
             category = analyze_prompt(prompt)
 
             if category:  # Skip /clear etc
-                by_date[date_str]["projects"][project].append({
-                    "time": dt.strftime("%H:%M"),
-                    "prompt": prompt[:80],
-                    "category": category,
-                })
-                by_date[date_str]["count"] += 1
-
-    print("""
+                by_day_proj[(date_str, project)].add(time_str, prompt[:80], category)
+                day_count[date_str] += 1
+
+    emit("""
 ╔═══════════════════════════════════════════════════════════════════════════════╗
 ║                                                                               ║
 ║    ██████╗ ██████╗ ███╗   ███╗██████╗ ██╗     ███████╗████████╗███████╗       ║
@@ -86,17 +129,23 @@ def main():
 """)
 
     # Sort dates
-    sorted_dates = sorted(by_date.keys())
+    sorted_dates = sorted(day_count)
 
     if not sorted_dates:
-        print("  No activity found.")
+        emit("  No activity found.")
+        sys.stdout.write("\n".join(out) + "\n")
         return
 
-    print(f"  📆 First activity: {sorted_dates[0]}")
-    print(f"  📆 Last activity: {sorted_dates[-1]}")
-    print(f"  📊 Total days: {len(sorted_dates)}")
-    print(f"  📝 Total prompts: {sum(d['count'] for d in by_date.values())}")
-    print()
+    emit(f"  📆 First activity: {sorted_dates[0]}")
+    emit(f"  📆 Last activity: {sorted_dates[-1]}")
+    emit(f"  📊 Total days: {len(sorted_dates)}")
+    emit(f"  📝 Total prompts: {sum(day_count.values())}")
+    emit("")
+
+    # Projects per day, in first-seen order
+    day_projects = defaultdict(list)
+    for date_str, project in by_day_proj:
+        day_projects[date_str].append(project)
 
     # Month grouping
     by_month = defaultdict(list)
@@ -106,7 +155,7 @@ def main():
 
     for month in sorted(by_month.keys()):
         month_dates = by_month[month]
-        month_prompts = sum(by_date[d]["count"] for d in month_dates)
+        month_prompts = sum(day_count[d] for d in month_dates)
 
         # Parse month for display
         try:
@@ -115,15 +164,13 @@ def main():
         except:
             month_display = month
 
-        print()
-        print(f"{'═' * 78}")
-        print(f"  📅 {month_display}")
-        print(f"     {len(month_dates)} days active • {month_prompts} prompts")
-        print(f"{'═' * 78}")
+        emit("")
+        emit(f"{'═' * 78}")
+        emit(f"  📅 {month_display}")
+        emit(f"     {len(month_dates)} days active • {month_prompts} prompts")
+        emit(f"{'═' * 78}")
 
         for date_str in month_dates:
-            day_data = by_date[date_str]
-
             # Parse for day name
             try:
                 dt = datetime.strptime(date_str, "%Y-%m-%d")
@@ -132,36 +179,35 @@ def main():
                 day_display = date_str
 
             # Projects for this day
-            projects = day_data["projects"]
+            projects = Counter({p: by_day_proj[(date_str, p)].count for p in day_projects[date_str]})
 
             # Activity bar
-            count = day_data["count"]
-            bar_len = min(count, 30)
-            bar = "█" * bar_len
+            count = day_count[date_str]
+            bar = _BLOCKS[:count]
 
-            print()
-            print(f"  ┌{'─' * 74}┐")
-            print(f"  │  {day_display}  {bar:<30}  {count:>3} prompts{' ' * 24}│")
-            print(f"  └{'─' * 74}┘")
+            emit("")
+            emit(f"  ┌{'─' * 74}┐")
+            emit(f"  │  {day_display}  {bar:<30}  {count:>3} prompts{' ' * 24}│")
+            emit(f"  └{'─' * 74}┘")
 
-            for proj_name, proj_entries in sorted(projects.items(), key=lambda x: -len(x[1])):
-                times = [e["time"] for e in proj_entries]
-                categories = set(e["category"] for e in proj_entries)
-
-                print(f"      📁 {proj_name}  [{min(times)} → {max(times)}]")
-                print(f"         {' '.join(categories)}  ({len(proj_entries)} prompts)")
+            for proj_name, _ in projects.most_common():
+                stats = by_day_proj[(date_str, proj_name)]
+                emit(f"      📁 {proj_name}  [{stats.first} → {stats.last}]")
+                emit(f"         {' '.join(stats.categories)}  ({stats.count} prompts)")
 
                 # Sample prompts
-                for entry in proj_entries[:2]:
-                    prompt = entry["prompt"].replace('\n', ' ').strip()[:55]
+                for prompt in stats.samples:
+                    prompt = prompt.replace('\n', ' ').strip()[:55]
                     if len(prompt) > 5:
-                        print(f"           • {prompt}...")
+                        emit(f"           • {prompt}...")
+
+    emit("")
+    emit("═" * 78)
+    emit("  📁 Logs stored at: ~/Desktop/cc-config/")
+    emit("  💡 Run /summary for today's engineering journal")
+    emit("")
 
-    print()
-    print("═" * 78)
-    print("  📁 Logs stored at: ~/Desktop/cc-config/")
-    print("  💡 Run /summary for today's engineering journal")
-    print()
+    sys.stdout.write("\n".join(out) + "\n")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,47 @@
+"""
+Shared readers for Claude Code's history.jsonl, used by the history scripts.
+"""
+
+import mmap
+import os
+import time
+from pathlib import Path
+
+HISTORY_FILE = Path.home() / ".claude" / "history.jsonl"
+
+
+def iter_history_lines(start=0, end=None):
+    """Yield non-blank raw lines of history.jsonl from a read-only memory map.
+
+    start/end restrict the scan to a byte range whose bounds fall on line starts.
+    """
+    with open(HISTORY_FILE, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return  # mmap refuses empty files
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            pos = start
+            end = len(mm) if end is None else min(end, len(mm))
+            while pos < end:
+                nl = mm.find(b"\n", pos, end)
+                if nl == -1:
+                    nl = end
+                line = mm[pos:nl]
+                pos = nl + 1
+                if line.strip():
+                    yield line
+
+
+# (date, hour, minute) of each 15-minute UTC slot. Every real UTC offset is
+# a multiple of 15 minutes, so one localtime() call covers the whole slot.
+_QUARTER_CACHE = {}
+
+
+def local_date_and_time(ts_ms):
+    """Convert a millisecond timestamp to local ("YYYY-MM-DD", "HH:MM") strings."""
+    quarter, rem = divmod(int(ts_ms // 1000), 900)
+    slot = _QUARTER_CACHE.get(quarter)
+    if slot is None:
+        lt = time.localtime(quarter * 900)
+        slot = _QUARTER_CACHE[quarter] = (time.strftime("%Y-%m-%d", lt), lt.tm_hour, lt.tm_min)
+    date_str, hour, minute = slot
+    return date_str, f"{hour:02d}:{minute + rem // 60:02d}"
@@ -7,29 +7,130 @@ Captures meaningful engineering context for daily journals.
 import json
 import sys
 import os
+import re
 from datetime import datetime
 from pathlib import Path
 
+try:
+    import orjson
+    json_loads = orjson.loads
+    json_dumps = orjson.dumps
+except ImportError:  # orjson is optional; the stdlib keeps the scripts zero-setup
+    json_loads = json.loads
+
+    def json_dumps(obj):
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode()
+
 CONFIG_DIR = Path.home() / "Desktop" / "cc-config"
 LOGS_DIR = CONFIG_DIR / "logs"
 LOGS_DIR.mkdir(parents=True, exist_ok=True)
 
+# Claude Code spawns the hook once per tool call, so one clock read serves
+# both the event timestamp and the day's log file
+_NOW = datetime.now()
+_LOG_FILE = LOGS_DIR / f"{_NOW:%Y-%m-%d}.jsonl"
+
 def get_log_file():
-    today = datetime.now().strftime("%Y-%m-%d")
-    return LOGS_DIR / f"{today}.jsonl"
+    return _LOG_FILE
 
 def log_event(event_data):
-    log_file = get_log_file()
-    with open(log_file, "a") as f:
-        f.write(json.dumps(event_data) + "\n")
+    # One O_APPEND write per event: no buffered file object, and concurrent
+    # hooks can't interleave partial lines
+    fd = os.open(get_log_file(), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, json_dumps(event_data) + b"\n")
+    finally:
+        os.close(fd)
+
+# Path components that never name a project
+SKIP_PATH_PARTS = frozenset({'Users', 'home', 'Desktop', 'Documents', 'Projects', 'Code', 'dev'})
 
 def extract_project_name(cwd):
     """Extract meaningful project name from path."""
-    parts = Path(cwd).parts
-    # Skip common prefixes
-    skip = {'Users', 'home', 'Desktop', 'Documents', 'Projects', 'Code', 'dev'}
-    meaningful = [p for p in parts if p not in skip and not p.startswith('.')]
-    return meaningful[-1] if meaningful else Path(cwd).name
+    meaningful = [p for p in cwd.split(os.sep) if p and p not in SKIP_PATH_PARTS and not p.startswith('.')]
+    if meaningful:
+        return meaningful[-1]
+    return os.sep if cwd.startswith(os.sep) else os.path.basename(cwd)
+
+# File extension -> kind of file written
+_EXT_CAT = {
+    '.py': 'code', '.js': 'code', '.ts': 'code', '.tsx': 'code', '.jsx': 'code',
+    '.md': 'docs', '.txt': 'docs', '.rst': 'docs',
+    '.json': 'config', '.yaml': 'config', '.yml': 'config', '.toml': 'config',
+    '.css': 'frontend', '.scss': 'frontend', '.html': 'frontend',
+}
+
+# Bash intents, checked in order: the first pattern that matches wins
+BASH_INTENTS = [
+    ("ran_tests", "testing", re.compile(r"test|jest|pytest|vitest|spec")),
+    ("built_project", "build", re.compile(r"build|compile|webpack|vite|tsc")),
+    ("installed_deps", "dependencies", re.compile(r"npm install|yarn add|pip install|cargo add")),
+    ("committed_code", "git", re.compile(r"git commit|git push")),
+    ("git_operation", "git", re.compile(r"git checkout|git branch|git merge")),
+    ("created_directory", "setup", re.compile(r"mkdir")),
+    ("infra_operation", "infrastructure", re.compile(r"docker|kubectl|terraform")),
+]
+
+# Each handler fills in the action-specific fields of the event
+def handle_write(event, tool_input):
+    filepath = tool_input.get("file_path", "")
+    event["action"] = "created_file"
+    event["file"] = os.path.basename(filepath)
+    event["path"] = filepath
+    # Infer what kind of file
+    category = _EXT_CAT.get(os.path.splitext(filepath)[1])
+    if category:
+        event["category"] = category
+
+def handle_edit(event, tool_input):
+    filepath = tool_input.get("file_path", "")
+    event["action"] = "modified_file"
+    event["file"] = os.path.basename(filepath)
+    event["path"] = filepath
+
+def handle_bash(event, tool_input):
+    cmd = tool_input.get("command", "")
+    desc = tool_input.get("description", "")
+    event["command"] = cmd[:200]
+    event["description"] = desc
+
+    # Categorize command intent
+    cmd_lower = cmd.lower()
+    for action, category, pattern in BASH_INTENTS:
+        if pattern.search(cmd_lower):
+            event["action"] = action
+            event["category"] = category
+            break
+    else:
+        event["action"] = "ran_command"
+
+def handle_task(event, tool_input):
+    event["action"] = "delegated_task"
+    event["task_type"] = tool_input.get("subagent_type", "")
+    event["task_description"] = tool_input.get("description", "")
+    event["task_prompt"] = tool_input.get("prompt", "")[:500]  # Capture what was asked
+
+def handle_todo_write(event, tool_input):
+    todos = tool_input.get("todos", [])
+    event["action"] = "planned_tasks"
+    event["tasks"] = [t.get("content", "") for t in todos if t.get("status") != "completed"]
+    event["completed"] = [t.get("content", "") for t in todos if t.get("status") == "completed"]
+
+def handle_web(event, tool_input):
+    event["action"] = "researched"
+    event["query"] = tool_input.get("query", tool_input.get("prompt", ""))[:200]
+
+# Read/Grep/Glob are too noisy to log and everything else is skipped, so
+# they simply have no handler
+HANDLERS = {
+    "Write": handle_write,
+    "Edit": handle_edit,
+    "Bash": handle_bash,
+    "Task": handle_task,
+    "TodoWrite": handle_todo_write,
+    "WebSearch": handle_web,
+    "WebFetch": handle_web,
+}
 
 def main():
     stdin_data = {}
@@ -37,13 +138,13 @@ def main():
         if not sys.stdin.isatty():
             content = sys.stdin.read()
             if content.strip():
-                stdin_data = json.loads(content)
+                stdin_data = json_loads(content)
     except:
         pass
 
     cwd = os.getcwd()
     event = {
-        "ts": datetime.now().strftime("%H:%M"),
+        "ts": _NOW.strftime("%H:%M"),
         "project": extract_project_name(cwd),
         "cwd": cwd,
     }
@@ -59,97 +160,12 @@ def main():
     if hook_event == "PreToolUse":
         return  # Skip pre-events, we'll capture post
 
-    event["tool"] = tool_name
-
-    # Capture high-level context based on tool
-    if tool_name == "Write":
-        filepath = tool_input.get("file_path", "")
-        event["action"] = "created_file"
-        event["file"] = Path(filepath).name
-        event["path"] = filepath
-        # Infer what kind of file
-        ext = Path(filepath).suffix
-        if ext in ('.py', '.js', '.ts', '.tsx', '.jsx'):
-            event["category"] = "code"
-        elif ext in ('.md', '.txt', '.rst'):
-            event["category"] = "docs"
-        elif ext in ('.json', '.yaml', '.yml', '.toml'):
-            event["category"] = "config"
-        elif ext in ('.css', '.scss', '.html'):
-            event["category"] = "frontend"
-
-    elif tool_name == "Edit":
-        filepath = tool_input.get("file_path", "")
-        event["action"] = "modified_file"
-        event["file"] = Path(filepath).name
-        event["path"] = filepath
-
-    elif tool_name == "Bash":
-        cmd = tool_input.get("command", "")
-        desc = tool_input.get("description", "")
-        event["command"] = cmd[:200]
-        event["description"] = desc
-
-        # Categorize command intent
-        cmd_lower = cmd.lower()
-        if any(x in cmd_lower for x in ['test', 'jest', 'pytest', 'vitest', 'spec']):
-            event["action"] = "ran_tests"
-            event["category"] = "testing"
-        elif any(x in cmd_lower for x in ['build', 'compile', 'webpack', 'vite', 'tsc']):
-            event["action"] = "built_project"
-            event["category"] = "build"
-        elif any(x in cmd_lower for x in ['npm install', 'yarn add', 'pip install', 'cargo add']):
-            event["action"] = "installed_deps"
-            event["category"] = "dependencies"
-        elif any(x in cmd_lower for x in ['git commit', 'git push']):
-            event["action"] = "committed_code"
-            event["category"] = "git"
-        elif any(x in cmd_lower for x in ['git checkout', 'git branch', 'git merge']):
-            event["action"] = "git_operation"
-            event["category"] = "git"
-        elif 'mkdir' in cmd_lower:
-            event["action"] = "created_directory"
-            event["category"] = "setup"
-        elif any(x in cmd_lower for x in ['docker', 'kubectl', 'terraform']):
-            event["action"] = "infra_operation"
-            event["category"] = "infrastructure"
-        else:
-            event["action"] = "ran_command"
-
-    elif tool_name == "Task":
-        event["action"] = "delegated_task"
-        event["task_type"] = tool_input.get("subagent_type", "")
-        event["task_description"] = tool_input.get("description", "")
-        event["task_prompt"] = tool_input.get("prompt", "")[:500]  # Capture what was asked
-
-    elif tool_name == "TodoWrite":
-        todos = tool_input.get("todos", [])
-        event["action"] = "planned_tasks"
-        event["tasks"] = [t.get("content", "") for t in todos if t.get("status") != "completed"]
-        event["completed"] = [t.get("content", "") for t in todos if t.get("status") == "completed"]
-
-    elif tool_name in ("WebSearch", "WebFetch"):
-        event["action"] = "researched"
-        event["query"] = tool_input.get("query", tool_input.get("prompt", ""))[:200]
-
-    elif tool_name == "Read":
-        # Only log reads if they seem significant (not just checking files)
-        filepath = tool_input.get("file_path", "")
-        event["action"] = "read_file"
-        event["file"] = Path(filepath).name
-        # Don't log every read - they're too noisy
-        return
-
-    elif tool_name in ("Grep", "Glob"):
-        event["action"] = "searched_code"
-        event["pattern"] = tool_input.get("pattern", "")
-        # Skip logging searches - too noisy
-        return
-
-    else:
-        # Skip unknown/noisy tools
+    handler = HANDLERS.get(tool_name)
+    if handler is None:
         return
 
+    event["tool"] = tool_name
+    handler(event, tool_input)
     log_event(event)
 
 if __name__ == "__main__":
@@ -9,6 +9,18 @@ import os
 import sys
 from pathlib import Path
 
+try:
+    import orjson
+    json_loads = orjson.loads
+
+    def json_dumps_pretty(obj):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
+except ImportError:  # orjson is optional; the stdlib keeps the scripts zero-setup
+    json_loads = json.loads
+
+    def json_dumps_pretty(obj):
+        return json.dumps(obj, indent=2).encode() + b"\n"
+
 SETTINGS_FILE = Path.home() / ".claude" / "settings.json"
 HOOK_COMMAND = str(Path.home() / "Desktop" / "cc-config" / "hooks" / "activity-logger.py")
 
@@ -19,8 +31,7 @@ def merge_hook_into_settings():
     # Load existing settings or create new
     if SETTINGS_FILE.exists():
         print(f"📖 Reading existing settings from {SETTINGS_FILE}")
-        with open(SETTINGS_FILE) as f:
-            settings = json.load(f)
+        settings = json_loads(SETTINGS_FILE.read_bytes())
     else:
         print(f"📝 Creating new settings file at {SETTINGS_FILE}")
         settings = {"model": "sonnet"}
@@ -60,9 +71,7 @@ def merge_hook_into_settings():
 
     # Write back to file
     SETTINGS_FILE.parent.mkdir(parents=True, exist_ok=True)
-    with open(SETTINGS_FILE, "w") as f:
-        json.dump(settings, f, indent=2)
-        f.write("\n")  # Add trailing newline
+    SETTINGS_FILE.write_bytes(json_dumps_pretty(settings))
 
     print(f"✅ Activity logger hook added to settings.json")
     return True
@@ -3,73 +3,90 @@
 Parse Claude Code history.jsonl to generate historical activity summaries.
 """
 
+import functools
 import json
+import re
 from datetime import datetime, timedelta
 from pathlib import Path
-from collections import defaultdict
+from collections import Counter, defaultdict, namedtuple
 import sys
 
-HISTORY_FILE = Path.home() / ".claude" / "history.jsonl"
+try:
+    from orjson import loads as json_loads
+except ImportError:  # orjson is optional; the stdlib keeps the scripts zero-setup
+    json_loads = json.loads
 
-def load_history():
-    """Load all history entries."""
-    entries = []
-    with open(HISTORY_FILE) as f:
-        for line in f:
-            if line.strip():
-                try:
-                    entry = json.loads(line)
-                    if "timestamp" in entry:
-                        entries.append(entry)
-                except:
-                    pass
-    return entries
+from history_common import HISTORY_FILE, iter_history_lines, local_date_and_time
+
+# Checked in order: the first category with a keyword hit wins
+PROMPT_CATEGORIES = [
+    ("debugging", re.compile(r"fix|bug|error|issue|broken|not working", re.I)),
+    ("building", re.compile(r"add|create|build|implement|new feature", re.I)),
+    ("refactoring", re.compile(r"refactor|clean|improve|optimize", re.I)),
+    ("testing", re.compile(r"test|spec|coverage", re.I)),
+    ("learning", re.compile(r"review|explain|understand|how does", re.I)),
+    ("deploying", re.compile(r"deploy|release|publish", re.I)),
+]
 
+# One grouped history entry; a tuple is far lighter than a per-entry dict
+Entry = namedtuple("Entry", "time project prompt category")
+
+def load_history():
+    """Load the timestamp, project and display columns of all history entries.
+
+    Only the three fields the report uses are kept, so bulky extras such as
+    pastedContents are freed as soon as each line is parsed.
+    """
+    timestamps, projects, displays = [], [], []
+    for line in iter_history_lines():
+        try:
+            entry = json_loads(line)
+            if "timestamp" in entry:
+                timestamps.append(entry["timestamp"])
+                projects.append(entry.get("project", ""))
+                displays.append(entry.get("display", ""))
+        except:
+            pass
+    return timestamps, projects, displays
+
+# Path components that never name a project
+SKIP_PATH_PARTS = frozenset({'Users', 'home', 'Desktop', 'Documents', 'Projects', 'Code', 'dev', 's3nik', 'dev playground'})
+
+@functools.lru_cache(maxsize=None)
 def extract_project_name(path):
     """Extract meaningful project name."""
     if not path:
         return "unknown"
     parts = Path(path).parts
-    skip = {'Users', 'home', 'Desktop', 'Documents', 'Projects', 'Code', 'dev', 's3nik', 'dev playground'}
-    meaningful = [p for p in parts if p not in skip and not p.startswith('.')]
+    meaningful = [p for p in parts if p not in SKIP_PATH_PARTS and not p.startswith('.')]
     return meaningful[-1] if meaningful else Path(path).name
 
+# Short prompts ("continue", "yes", "commit this") repeat constantly;
+# each distinct text only needs the regex pass once
+@functools.lru_cache(maxsize=None)
 def analyze_prompt(text):
     """Categorize what kind of work a prompt represents."""
-    text_lower = text.lower() if text else ""
-
-    if any(x in text_lower for x in ['fix', 'bug', 'error', 'issue', 'broken', 'not working']):
-        return "debugging"
-    elif any(x in text_lower for x in ['add', 'create', 'build', 'implement', 'new feature']):
-        return "building"
-    elif any(x in text_lower for x in ['refactor', 'clean', 'improve', 'optimize']):
-        return "refactoring"
-    elif any(x in text_lower for x in ['test', 'spec', 'coverage']):
-        return "testing"
-    elif any(x in text_lower for x in ['review', 'explain', 'understand', 'how does']):
-        return "learning"
-    elif any(x in text_lower for x in ['deploy', 'release', 'publish']):
-        return "deploying"
-    elif '/clear' in text_lower or len(text_lower) < 10:
+    text = text or ""
+    for category, pattern in PROMPT_CATEGORIES:
+        if pattern.search(text):
+            return category
+    if '/clear' in text.lower() or len(text) < 10:
         return "command"
-    else:
-        return "coding"
+    return "coding"
 
-def group_by_date(entries):
-    """Group entries by date."""
+def group_by_date(history):
+    """Group history columns by date."""
     by_date = defaultdict(list)
-    for e in entries:
-        ts = e.get("timestamp", 0)
+    for ts, project, display in zip(*history):
         if ts:
             # Timestamp is in milliseconds
-            dt = datetime.fromtimestamp(ts / 1000)
-            date_str = dt.strftime("%Y-%m-%d")
-            by_date[date_str].append({
-                "time": dt.strftime("%H:%M"),
-                "project": extract_project_name(e.get("project", "")),
-                "prompt": e.get("display", "")[:200],
-                "category": analyze_prompt(e.get("display", "")),
-            })
+            date_str, time_str = local_date_and_time(ts)
+            by_date[date_str].append(Entry(
+                time_str,
+                extract_project_name(project),
+                display[:200],
+                analyze_prompt(display),
+            ))
     return dict(by_date)
 
 def render_day(date_str, entries):
@@ -85,18 +102,20 @@ def render_day(date_str, entries):
 
     # Group by project
     projects = defaultdict(lambda: {"prompts": [], "categories": set(), "times": []})
+    proj_counts = Counter()
     for e in entries:
-        if e["category"] != "command":  # Skip /clear etc
-            proj = e["project"]
-            projects[proj]["prompts"].append(e["prompt"])
-            projects[proj]["categories"].add(e["category"])
-            projects[proj]["times"].append(e["time"])
+        if e.category != "command":  # Skip /clear etc
+            proj = e.project
+            proj_counts[proj] += 1
+            projects[proj]["prompts"].append(e.prompt)
+            projects[proj]["categories"].add(e.category)
+            projects[proj]["times"].append(e.time)
 
     if not projects:
         return None
 
     # Calculate stats
-    total_prompts = sum(len(p["prompts"]) for p in projects.values())
+    total_prompts = sum(proj_counts.values())
     all_categories = set()
     for p in projects.values():
         all_categories.update(p["categories"])
@@ -110,7 +129,8 @@ def render_day(date_str, entries):
     lines.append(f"└{'─' * 76}┘")
 
     # Per project
-    for proj_name, data in sorted(projects.items(), key=lambda x: -len(x[1]["prompts"])):
+    for proj_name, _ in proj_counts.most_common():
+        data = projects[proj_name]
         times = data["times"]
         time_range = f"{min(times)} → {max(times)}" if times else ""
 
@@ -142,6 +162,11 @@ def render_day(date_str, entries):
 
     return "\n".join(lines)
 
+# Prebuilt bar strips; charts slice them instead of repeating characters per row
+_BAR_FULL = "█" * 50
+_BAR_EMPTY = "░" * 50
+_SHADE_RUNS = [shade * 30 for shade in ("░", "▒", "▓", "█", "█")]
+
 def render_week_chart(by_date, days=7):
     """Render week activity chart."""
     lines = []
@@ -159,15 +184,16 @@ def render_week_chart(by_date, days=7):
         date_str = day.strftime("%Y-%m-%d")
         day_name = day.strftime("%a")
         entries = by_date.get(date_str, [])
-        meaningful = [e for e in entries if e.get("category") != "command"]
+        meaningful = [e for e in entries if e.category != "command"]
         week_data.append((day_name, date_str, len(meaningful)))
 
     max_count = max(d[2] for d in week_data) if week_data else 1
+    today_str = today.strftime("%Y-%m-%d")
 
     for day_name, date_str, count in week_data:
         bar_len = int((count / max(max_count, 1)) * 45)
-        bar = "█" * bar_len + "░" * (45 - bar_len)
-        is_today = date_str == today.strftime("%Y-%m-%d")
+        bar = _BAR_FULL[:bar_len] + _BAR_EMPTY[:45 - bar_len]
+        is_today = date_str == today_str
         marker = "→" if is_today else " "
         lines.append(f"  {marker} {day_name} │{bar}│ {count:3}")
 
@@ -192,7 +218,7 @@ def render_month_chart(by_date):
     while current <= today:
         date_str = current.strftime("%Y-%m-%d")
         entries = by_date.get(date_str, [])
-        meaningful = [e for e in entries if e.get("category") != "command"]
+        meaningful = [e for e in entries if e.category != "command"]
         if meaningful:
             month_data.append((current.strftime("%d"), date_str, len(meaningful)))
         current += timedelta(days=1)
@@ -212,13 +238,16 @@ def render_month_chart(by_date):
     # Mini chart per day
     for day_num, date_str, count in month_data:
         intensity = int((count / max(max_count, 1)) * 4)
-        block = ["░", "▒", "▓", "█", "█"][intensity]
-        lines.append(f"    {date_str}: {block * min(count, 30)} ({count})")
+        lines.append(f"    {date_str}: {_SHADE_RUNS[intensity][:count]} ({count})")
 
     return "\n".join(lines)
 
 def main():
-    print("""
+    # Render into one buffer and write it once instead of a print() per line
+    out = []
+    emit = out.append
+
+    emit("""
 ╔═══════════════════════════════════════════════════════════════════════════════╗
 ║                                                                               ║
 ║   ██╗  ██╗██╗███████╗████████╗ ██████╗ ██████╗ ██╗   ██╗                      ║
@@ -232,27 +261,27 @@ def main():
 ╚═══════════════════════════════════════════════════════════════════════════════╝
 """)
 
-    entries = load_history()
-    print(f"  📊 Loaded {len(entries)} history entries")
+    history = load_history()
+    emit(f"  📊 Loaded {len(history[0])} history entries")
 
-    by_date = group_by_date(entries)
+    by_date = group_by_date(history)
     dates = sorted(by_date.keys())
 
     if dates:
-        print(f"  📆 Date range: {dates[0]} → {dates[-1]}")
-        print(f"  📁 Days with activity: {len(dates)}")
+        emit(f"  📆 Date range: {dates[0]} → {dates[-1]}")
+        emit(f"  📁 Days with activity: {len(dates)}")
 
     # Week chart
-    print(render_week_chart(by_date))
+    emit(render_week_chart(by_date))
 
     # Month chart
-    print(render_month_chart(by_date))
+    emit(render_month_chart(by_date))
 
     # Per-day breakdown for last 7 days
-    print("")
-    print("═" * 78)
-    print("                         DAILY BREAKDOWN (LAST 7 DAYS)")
-    print("═" * 78)
+    emit("")
+    emit("═" * 78)
+    emit("                         DAILY BREAKDOWN (LAST 7 DAYS)")
+    emit("═" * 78)
 
     today = datetime.now()
     for i in range(6, -1, -1):
@@ -261,23 +290,23 @@ def main():
         if date_str in by_date:
             day_summary = render_day(date_str, by_date[date_str])
             if day_summary:
-                print(day_summary)
+                emit(day_summary)
 
     # All time stats
-    print("")
-    print("═" * 78)
-    print("                              ALL TIME STATS")
-    print("═" * 78)
+    emit("")
+    emit("═" * 78)
+    emit("                              ALL TIME STATS")
+    emit("═" * 78)
 
-    all_projects = set()
+    all_projects = Counter()
     all_categories = defaultdict(int)
     for date_str, day_entries in by_date.items():
         for e in day_entries:
-            if e["category"] != "command":
-                all_projects.add(e["project"])
-                all_categories[e["category"]] += 1
+            if e.category != "command":
+                all_projects[e.project] += 1
+                all_categories[e.category] += 1
 
-    print(f"""
+    emit(f"""
   📁 Total projects worked on: {len(all_projects)}
   📝 Total meaningful prompts: {sum(all_categories.values())}
 
@@ -298,18 +327,20 @@ def main():
     for cat, count in sorted(all_categories.items(), key=lambda x: -x[1]):
         icon = cat_icons.get(cat, "•")
         pct = int((count / total) * 100) if total > 0 else 0
-        bar = "█" * (pct // 2) + "░" * (50 - pct // 2)
-        print(f"    {icon} {cat:12} {bar} {pct:3}% ({count})")
+        bar = _BAR_FULL[:pct // 2] + _BAR_EMPTY[:50 - pct // 2]
+        emit(f"    {icon} {cat:12} {bar} {pct:3}% ({count})")
 
-    print(f"""
+    emit(f"""
   Projects:
 """)
-    for proj in sorted(all_projects)[:15]:
-        print(f"    • {proj}")
+    for proj, _ in all_projects.most_common(15):
+        emit(f"    • {proj}")
     if len(all_projects) > 15:
-        print(f"    ... and {len(all_projects) - 15} more")
+        emit(f"    ... and {len(all_projects) - 15} more")
+
+    emit("")
 
-    print("")
+    sys.stdout.write("\n".join(out) + "\n")
 
 if __name__ == "__main__":
     main()
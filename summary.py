@@ -4,15 +4,26 @@ Claude Code Engineering Journal
 Generates narrative summaries of what you actually built.
 """
 
+import functools
+import heapq
 import json
 import os
+import re
 import sys
-import subprocess
+import importlib.util
 from datetime import datetime, timedelta
 from pathlib import Path
-from collections import defaultdict
+from bisect import bisect_left, bisect_right
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter, mul
 import argparse
 
+try:
+    from orjson import loads as json_loads
+except ImportError:  # orjson is optional; the stdlib keeps the scripts zero-setup
+    json_loads = json.loads
+
 CONFIG_DIR = Path.home() / "Desktop" / "cc-config"
 LOGS_DIR = CONFIG_DIR / "logs"
 SUMMARIES_DIR = CONFIG_DIR / "summaries"
@@ -21,59 +32,100 @@ SYNC_SCRIPT = CONFIG_DIR / "sync-native-logs.py"
 
 STATS_FILE = CONFIG_DIR / "logs" / ".stats.json"
 
+# Box rules and bar strips shared by the renderers; bars slice these
+# rather than repeating characters on every row
+BOX_TOP = "┌" + "─" * 76 + "┐"
+BOX_MID = "├" + "─" * 76 + "┤"
+BOX_BOTTOM = "└" + "─" * 76 + "┘"
+BAR_FULL = "█" * 40
+BAR_EMPTY = "░" * 40
+
 
 def auto_sync_native_logs():
-    """Auto-sync native logs before generating summary."""
+    """Auto-sync native logs before generating summary.
+
+    The sync script runs in this process rather than a second interpreter,
+    which would cost a cold start on every summary. It finishes before any
+    log or stats file is read, so a summary never sees a half-done sync.
+    """
     if SYNC_SCRIPT.exists():
         try:
-            subprocess.run(
-                ["python3", str(SYNC_SCRIPT), "--quiet"],
-                capture_output=True,
-                timeout=30
-            )
-        except:
+            spec = importlib.util.spec_from_file_location("sync_native_logs", SYNC_SCRIPT)
+            sync_module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(sync_module)
+            sync_module.sync(quiet=True)
+        except Exception:
             pass  # Silently fail if sync has issues
 
 
+# Parsed .stats.json keyed by (mtime_ns, size); one render reads it several times
+_stats_cache = {}
+
 def load_usage_stats() -> dict:
     """Load usage stats from sync script."""
-    if STATS_FILE.exists():
+    try:
+        st = STATS_FILE.stat()
+    except OSError:
+        return {}
+    key = (st.st_mtime_ns, st.st_size)
+    if key not in _stats_cache:
         try:
-            with open(STATS_FILE) as f:
-                return json.load(f)
+            stats = json_loads(STATS_FILE.read_bytes())
         except:
-            pass
-    return {}
-
-
-def render_usage_stats(date_str: str = None, start_date: str = None, end_date: str = None) -> str:
-    """Render usage statistics section. Supports single date or date range."""
+            stats = {}
+        _stats_cache.clear()
+        _stats_cache[key] = stats
+    return _stats_cache[key]
+
+
+# (by_date, columns) of the last usage_columns() call; by_date is the dict
+# held by the load_usage_stats() cache, so identity means nothing changed
+_usage_columns = (None, None)
+
+def usage_columns(by_date):
+    """Sorted dates of `by_date` plus parallel cost/requests/input/output lists."""
+    global _usage_columns
+    if _usage_columns[0] is not by_date:
+        dates = sorted(by_date)
+        rows = [by_date[d] for d in dates]
+        _usage_columns = (by_date, (
+            dates,
+            [r.get('cost', 0) for r in rows],
+            [r.get('requests', 0) for r in rows],
+            [r.get('input', 0) for r in rows],
+            [r.get('output', 0) for r in rows],
+        ))
+    return _usage_columns[1]
+
+
+def render_usage_stats(date_str: str = None, start_date: str = None, end_date: str = None,
+                       all_projects: bool = False) -> str:
+    """Render usage statistics section. Supports single date or date range.
+
+    Usage is recorded per day, not per project and day; `all_projects` labels
+    the section as such when the rest of the view is filtered to a project.
+    """
     stats = load_usage_stats()
     if not stats:
         return ""
 
     lines = []
     lines.append("\n" + "─" * 60)
-    lines.append("💰 Usage Statistics")
+    lines.append("💰 Usage Statistics" + (" (all projects)" if all_projects else ""))
     lines.append("─" * 60)
 
     by_date = stats.get('by_date', {})
 
     # Date range stats
     if start_date and end_date:
-        range_cost = 0.0
-        range_requests = 0
-        range_input = 0
-        range_output = 0
-        days_with_activity = 0
-
-        for d, d_stats in by_date.items():
-            if start_date <= d <= end_date:
-                range_cost += d_stats.get('cost', 0)
-                range_requests += d_stats.get('requests', 0)
-                range_input += d_stats.get('input', 0)
-                range_output += d_stats.get('output', 0)
-                days_with_activity += 1
+        dates, costs, requests, inputs, outputs = usage_columns(by_date)
+        lo = bisect_left(dates, start_date)
+        hi = bisect_right(dates, end_date)
+        range_cost = sum(costs[lo:hi], 0.0)
+        range_requests = sum(requests[lo:hi])
+        range_input = sum(inputs[lo:hi])
+        range_output = sum(outputs[lo:hi])
+        days_with_activity = hi - lo
 
         lines.append(f"  Period: ${range_cost:.2f} ({range_requests:,} requests)")
         lines.append(f"  Tokens: {(range_input + range_output):,} ({days_with_activity} days)")
@@ -108,9 +160,9 @@ def render_usage_stats(date_str: str = None, start_date: str = None, end_date: s
     if start_date and end_date:
         by_project = stats.get('by_project', {})
         if by_project:
-            top_projects = sorted(by_project.items(), key=lambda x: -x[1]['cost'])[:5]
+            top_projects = heapq.nlargest(3, by_project.items(), key=lambda x: x[1]['cost'])
             proj_parts = [f"{p}: ${d['cost']:.2f}" for p, d in top_projects]
-            lines.append(f"  Top: {' | '.join(proj_parts[:3])}")
+            lines.append(f"  Top: {' | '.join(proj_parts)}")
     else:
         # Recent days (last 3) for single day view
         if by_date:
@@ -138,171 +190,553 @@ HEADER = """
 ╚═══════════════════════════════════════════════════════════════════════════════╝
 """
 
-def load_logs(date_str):
-    """Load logs for a specific date."""
-    log_file = LOGS_DIR / f"{date_str}.jsonl"
-    if not log_file.exists():
-        return []
-    events = []
-    with open(log_file) as f:
+def project_needles(project):
+    """Raw-line markers of events for `project`, or None if it can't be matched safely.
+
+    Logs are written compact ("project":"x") and, in older files, with a space
+    after the colon. Names needing JSON escapes may be encoded differently by
+    each writer, so those fall back to parse-then-filter.
+    """
+    if not project.isascii() or not project.isprintable() or '"' in project or '\\' in project:
+        return None
+    value = f'"{project}"'.encode()
+    return (b'"project":' + value, b'"project": ' + value)
+
+def iter_logs(date_str, project=None):
+    """Yield the events logged on a specific date, one at a time.
+
+    With `project`, only that project's events are yielded; lines that can't
+    mention it are skipped before they are decoded.
+    """
+    try:
+        f = open(LOGS_DIR / f"{date_str}.jsonl", "rb", buffering=1 << 20)
+    except FileNotFoundError:
+        return
+    needles = project_needles(project) if project else None
+    with f:
+        # Binary lines go straight to the decoder: no text-layer decoding or
+        # newline translation
         for line in f:
+            if needles and needles[0] not in line and needles[1] not in line:
+                continue
             if line.strip():
                 try:
-                    events.append(json.loads(line))
-                except:
-                    pass
+                    e = json_loads(line)
+                except ValueError:  # JSONDecodeError (stdlib or orjson) and bad UTF-8
+                    continue
+                if project is None or e.get("project") == project:
+                    yield e
+
+def load_logs(date_str, project=None):
+    """Load logs for a specific date."""
+    if project:
+        return list(iter_logs(date_str, project))
+    try:
+        data = (LOGS_DIR / f"{date_str}.jsonl").read_bytes()
+    except FileNotFoundError:
+        return []
+    # Whole-day load: one read and one comprehension; a bad line sends the
+    # day back through iter_logs, which skips it
+    try:
+        return [json_loads(line) for line in data.split(b"\n") if line.strip()]
+    except ValueError:
+        return list(iter_logs(date_str))
+
+def tail_logs(date_str, count, project=None):
+    """Return the last `count` events logged on a date, oldest first.
+
+    Lines are decoded from the end of the log and only until `count` events
+    are found; bad lines are skipped as in iter_logs().
+    """
+    try:
+        data = (LOGS_DIR / f"{date_str}.jsonl").read_bytes()
+    except FileNotFoundError:
+        return []
+    tail = []
+    for line in reversed(data.split(b"\n")):
+        if len(tail) == count:
+            break
+        if line.strip():
+            try:
+                e = json_loads(line)
+            except ValueError:
+                continue
+            if project is None or e.get("project") == project:
+                tail.append(e)
+    tail.reverse()
+    return tail
+
+MEANINGFUL_ACTIONS = frozenset({"created_file", "modified_file", "committed_code", "ran_tests", "built_project"})
+
+# Raw-line form of a meaningful event's action, in both the compact and the
+# older spaced log format. Quotes inside string values are escaped, so this
+# only matches "action" keys, though possibly one nested in a payload.
+MEANINGFUL_ACTION_RE = re.compile(
+    rb'"action": ?"(?:' + "|".join(sorted(MEANINGFUL_ACTIONS)).encode() + rb')"'
+)
+
+class LogIndex:
+    """Per-day values derived from the logs, cached in a JSON sidecar file.
+
+    Entries are keyed by the log file's size and mtime, so a day is only
+    re-derived after its log changes; views that need these values skip
+    re-parsing days that haven't changed since the last run.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._entries = None
+        self._dirty = False
+
+    def entries(self):
+        if self._entries is None:
+            try:
+                self._entries = json_loads(self.path.read_bytes())
+            except (OSError, ValueError):
+                self._entries = {}
+        return self._entries
+
+    def get(self, date_str, st):
+        """The cached value for a day whose log has stat `st`, or None if stale."""
+        entry = self.entries().get(date_str)
+        if entry and len(entry) == 3 and entry[0] == st.st_size and entry[1] == st.st_mtime_ns:
+            return entry[2]
+        return None
+
+    def put(self, date_str, st, value):
+        self.entries()[date_str] = [st.st_size, st.st_mtime_ns, value]
+        self._dirty = True
+
+    def save(self):
+        """Persist values recomputed during this run, if any."""
+        if not self._dirty:
+            return
+        try:
+            tmp_file = self.path.with_suffix(".tmp")
+            tmp_file.write_text(json.dumps(self._entries, separators=(",", ":")))
+            os.replace(tmp_file, self.path)
+        except OSError:
+            pass  # The index is only a cache
+        self._dirty = False
+
+# (meaningful, total) event counts per day
+COUNTS_INDEX = LogIndex(LOGS_DIR / ".counts.json")
+# Per-day analysis headline for the date picker, see day_overview()
+OVERVIEW_INDEX = LogIndex(LOGS_DIR / ".overview.json")
+
+def _decode(line):
+    """The event on a raw log line, or None if it doesn't decode to an object."""
+    try:
+        e = json_loads(line)
+    except ValueError:
+        return None
+    return e if isinstance(e, dict) else None
+
+def event_lines(data):
+    """Return the lines of a raw day log that hold an event.
+
+    An approximation of the lines iter_logs() would decode, for counting
+    without decoding every event. A newline-terminated line that looks like a
+    whole object ({" ... } with balanced braces and no dangling comma or colon
+    before the last one) is taken as an event undecoded; any other line,
+    including an unterminated last line a writer may still be appending to,
+    must decode. A line that looks whole but is corrupt inside is still
+    counted.
+    """
+    lines = data.split(b"\n")
+    last = lines.pop()  # b"" when the log ends with a newline
+    events = []
+    for line in lines:
+        body = line.strip()
+        if not body:
+            continue
+        if (body[:2] == b'{"' and body[-1:] == b"}" and body[-2:-1] not in (b",", b":")
+                and body.count(b"{") == body.count(b"}")) or _decode(body):
+            events.append(line)
+    if last.strip() and _decode(last):
+        events.append(last)
     return events
 
+def is_top_level(line, key, match):
+    """Whether `match`, a raw match of the quoted `key` on an event line, is the event's own key.
+
+    True when the key appears once and no "{" precedes it but the outer
+    object's; a key nested in a payload, or one after a brace inside a
+    string, returns False and the line should be decoded instead.
+    """
+    return line.count(key) == 1 and line.count(b"{", 0, match.start()) == 1
+
+def count_log_events(date_str):
+    """Return (meaningful, total) event counts for a date.
+
+    Served from the counts index while the log file is unchanged; otherwise
+    recounted from the raw bytes with event_lines(), and the index entry
+    refreshed. A meaningful action counts without decoding when it is
+    plainly the event's own key (see is_top_level()); otherwise the line is
+    decoded to read the event's action.
+    """
+    log_file = LOGS_DIR / f"{date_str}.jsonl"
+    try:
+        st = os.stat(log_file)
+    except OSError:
+        return 0, 0
+    cached = COUNTS_INDEX.get(date_str, st)
+    if cached:
+        return tuple(cached)
+
+    try:
+        # Read no further than the stat the index entry is keyed by
+        with open(log_file, "rb") as f:
+            data = f.read(st.st_size)
+    except OSError:
+        return 0, 0
+    lines = event_lines(data)
+    total = len(lines)
+    meaningful = 0
+    for line in lines:
+        m = MEANINGFUL_ACTION_RE.search(line)
+        if m:
+            if is_top_level(line, b'"action"', m):
+                meaningful += 1
+            else:
+                e = _decode(line)
+                meaningful += e is not None and e.get("action") in MEANINGFUL_ACTIONS
+    COUNTS_INDEX.put(date_str, st, [meaningful, total])
+    return meaningful, total
+
+def count_days(date_strs):
+    """count_log_events() for several dates, reading the logs on a thread pool."""
+    COUNTS_INDEX.entries()  # load once, before the workers share it
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        counts = list(pool.map(count_log_events, date_strs))
+    COUNTS_INDEX.save()
+    return counts
+
+def day_overview(date_str):
+    """Return (project names, files created, files modified, tasks completed) for a date.
+
+    The headline for each day in --pick and --pick-list. Served from the overview index
+    while the log file is unchanged; otherwise the day is loaded, analyzed and
+    the index entry refreshed.
+    """
+    try:
+        st = os.stat(LOGS_DIR / f"{date_str}.jsonl")
+    except OSError:
+        return [], 0, 0, 0
+    cached = OVERVIEW_INDEX.get(date_str, st)
+    if cached:
+        return tuple(cached)
+
+    projects, totals = analyze_events(load_logs(date_str))
+    overview = (list(projects), totals.files_created, totals.files_modified, totals.tasks_completed)
+    OVERVIEW_INDEX.put(date_str, st, overview)
+    return overview
+
+def day_overviews(date_strs):
+    """day_overview() for several dates, loading the uncached logs on a thread pool."""
+    OVERVIEW_INDEX.entries()  # load once, before the workers share it
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        overviews = list(pool.map(day_overview, date_strs))
+    OVERVIEW_INDEX.save()
+    return overviews
+
+# A raw line's project value, in either log format (see MEANINGFUL_ACTION_RE)
+PROJECT_VALUE_RE = re.compile(rb'"project": ?"((?:[^"\\]|\\.)*)"')
+
+def summarize_log(date_str):
+    """Return (event count, distinct project count) for a date.
+
+    Counted from the raw event lines, like count_log_events(); a line's
+    project is read raw when it is the event's own key (see is_top_level())
+    and decoded otherwise. Values with escapes go through the JSON decoder,
+    since writers may escape differently.
+    """
+    try:
+        data = (LOGS_DIR / f"{date_str}.jsonl").read_bytes()
+    except OSError:
+        return 0, 0
+    lines = event_lines(data)
+    projects = set()
+    for line in lines:
+        m = PROJECT_VALUE_RE.search(line)
+        if m and is_top_level(line, b'"project"', m):
+            v = m.group(1)
+            projects.add(json_loads(b'"' + v + b'"') if b"\\" in v else v.decode("utf-8", "replace"))
+        elif b'"project"' in line:
+            e = _decode(line)
+            if e is not None and isinstance(e.get("project"), str):
+                projects.add(e["project"])
+    projects.discard("")
+    return len(lines), len(projects)
+
+@functools.lru_cache(maxsize=None)
+def parse_day(date_str):
+    """Parse a "YYYY-MM-DD" log date; cached because views format the same days repeatedly."""
+    return datetime.strptime(date_str, "%Y-%m-%d")
+
 def get_available_dates():
     """Get all dates with logs."""
-    if not LOGS_DIR.exists():
+    try:
+        with os.scandir(LOGS_DIR) as it:
+            dates = [entry.name[:-6] for entry in it
+                     if entry.name.endswith(".jsonl") and entry.is_file()]
+    except FileNotFoundError:
         return []
-    return sorted([f.stem for f in LOGS_DIR.glob("*.jsonl")], reverse=True)
+    return sorted(dates, reverse=True)
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # ANALYSIS
 # ═══════════════════════════════════════════════════════════════════════════════
 
-def analyze_events(events):
-    """Analyze events into meaningful work summaries."""
-
-    projects = defaultdict(lambda: {
-        "files_created": [],
-        "files_modified": [],
-        "tasks_planned": [],
-        "tasks_completed": [],
-        "commands": [],
-        "research": [],
-        "delegated": [],
-        "prompts": [],  # For backfilled data
-        "timeline": [],
-        "categories": set(),
-        "has_backfill": False,
+class ProjectAgg:
+    """Everything one project did over the analyzed events."""
+
+    __slots__ = (
+        "files_created", "files_modified", "tasks_planned", "tasks_completed",
+        "commands", "research", "delegated", "prompts", "categories",
+        "has_backfill", "user_intents", "plans", "completion_count", "branches",
+        "sessions", "web_research_count", "research_count", "event_count",
+        "first_ts", "last_ts", "deliverables",
+    )
+
+    def __init__(self):
+        self.files_created = []
+        self.files_modified = []
+        self.tasks_planned = []
+        self.tasks_completed = {}  # insertion-ordered set of old-style completions
+        self.commands = []
+        self.research = []
+        self.delegated = []
+        self.prompts = []  # For backfilled data
+        self.categories = set()
+        self.has_backfill = False
         # Narrative fields
-        "user_intents": [],
-        "plans": [],
-        "completion_count": 0,
-        "branches": set(),
-        "sessions": set(),
-        "web_research_count": 0,
-        "research_count": 0,
+        self.user_intents = []
+        self.plans = []
+        self.completion_count = 0
+        self.branches = set()
+        self.sessions = set()
+        self.web_research_count = 0
+        self.research_count = 0
+        # Time span: only the bounds are ever shown, so no per-event list is
+        # kept. min/max as events arrive, since logs aren't time-ordered.
+        self.event_count = 0  # timestamped events
+        self.first_ts = None
+        self.last_ts = None
+        self.deliverables = None  # see project_deliverables()
+
+
+class DayTotals:
+    """Totals across all projects, gathered while the events are analyzed."""
+
+    __slots__ = (
+        "files_created", "files_modified", "tasks_completed", "completed",
+        "planned", "active_projects", "event_count", "first_ts", "last_ts",
+    )
+
+    def __init__(self):
+        self.files_created = 0
+        self.files_modified = 0
+        self.tasks_completed = 0  # unique old-style (TodoWrite) completions
+        self.completed = 0        # TaskUpdate completions + tasks_completed
+        self.planned = 0
+        self.active_projects = 0  # projects that created, modified or planned
+        # Time span across projects, as on ProjectAgg
+        self.event_count = 0
+        self.first_ts = None
+        self.last_ts = None
+
+
+def projects_by_activity(projects):
+    """(name, ProjectAgg) pairs, busiest first; ties keep first-seen order."""
+    return sorted(projects.items(), key=lambda x: -x[1].event_count)
+
+
+# System/command noise that never reflects a real user intent
+PROMPT_NOISE = ('<command-', '<local-command-', '<task-notification>',
+                'This session is being continued', 'Caveat: The messages')
+PROMPT_NOISE_RE = re.compile("|".join(map(re.escape, PROMPT_NOISE)))
+
+def _on_user_prompt(p, e, ts):
+    prompt = e.get("prompt", "")
+    # Handle backfilled events (from history.jsonl)
+    if e.get("source") == "backfill":
+        p.prompts.append({
+            "prompt": prompt,
+            "time": ts,
+        })
+        p.has_backfill = True
+        return
+    # User prompts — extract real intents
+    if not PROMPT_NOISE_RE.search(prompt):
+        p.user_intents.append({
+            "prompt": prompt,
+            "time": ts,
+        })
+
+# The *_lc fields are lowercased once here for the pattern and grouping
+# checks, instead of on every render
+def _on_created_file(p, e, ts):
+    get = e.get
+    filename = get("file", "")
+    path = get("path", "")
+    category = get("category", "")
+    p.files_created.append({
+        "file": filename,
+        "path": path,
+        "file_lc": filename.lower(),
+        "path_lc": path.lower(),
+        "category": category,
+        "time": ts,
+    })
+    if category:
+        p.categories.add(category)
+
+def _on_modified_file(p, e, ts):
+    get = e.get
+    p.files_modified.append({
+        "file": get("file", ""),
+        "path": get("path", ""),
+        "time": ts,
     })
 
-    for e in events:
-        project = e.get("project", "unknown")
-        action = e.get("action", "")
-        ts = e.get("ts", "")
-        source = e.get("source", "")
+# Task planning — from both old TodoWrite and new TaskCreate
+def _on_planned_tasks(p, e, ts):
+    p.tasks_planned.extend(e.get("tasks", []))
+    p.tasks_completed.update(dict.fromkeys(e.get("completed", [])))
+
+def _on_task_planned(p, e, ts):
+    task = e.get("task", "")
+    if task:
+        p.plans.append(task)
+
+# Task completion — from TaskUpdate
+def _on_task_completed(p, e, ts):
+    p.completion_count += 1
+
+# Commands — from both old activity-logger and new sync
+def _on_command(p, e, ts):
+    get = e.get
+    command = get("command", "")
+    category = get("category", "")
+    p.commands.append({
+        "action": get("action", ""),
+        "command": command,
+        "command_lc": command.lower(),
+        "description": get("description", ""),
+        "category": category,
+        "time": ts,
+    })
+    if category:
+        p.categories.add(category)
+
+# Research — from both old and new formats
+def _on_researched(p, e, ts):
+    p.research.append({
+        "query": e.get("query", ""),
+        "time": ts,
+    })
 
-        # Track session and branch
-        if e.get("session"):
-            projects[project]["sessions"].add(e["session"])
-        if e.get("branch") and e["branch"] != "HEAD":
-            projects[project]["branches"].add(e["branch"])
-
-        # Handle backfilled events (from history.jsonl)
-        if source == "backfill" and action == "user_prompt":
-            projects[project]["prompts"].append({
-                "prompt": e.get("prompt", ""),
-                "time": ts,
-            })
-            projects[project]["has_backfill"] = True
-            if ts:
-                projects[project]["timeline"].append(ts)
-            continue
+def _on_research(p, e, ts):
+    p.research_count += 1
 
-        # User prompts — extract real intents
-        if action == "user_prompt":
-            prompt = e.get("prompt", "")
-            # Filter out system/command noise
-            noise = ['<command-', '<local-command-', '<task-notification>',
-                     'This session is being continued', 'Caveat: The messages']
-            if not any(skip in prompt for skip in noise):
-                projects[project]["user_intents"].append({
-                    "prompt": prompt,
-                    "time": ts,
-                })
-            if ts:
-                projects[project]["timeline"].append(ts)
-            continue
+def _on_web_research(p, e, ts):
+    p.web_research_count += 1
 
-        if action == "created_file":
-            projects[project]["files_created"].append({
-                "file": e.get("file", ""),
-                "path": e.get("path", ""),
-                "category": e.get("category", ""),
-                "time": ts,
-            })
-            if e.get("category"):
-                projects[project]["categories"].add(e["category"])
+# Delegated work — from both old and new formats
+def _on_delegated_task(p, e, ts):
+    get = e.get
+    p.delegated.append({
+        "type": get("task_type", ""),
+        "description": get("task_description", ""),
+        "prompt": get("task_prompt", ""),
+        "time": ts,
+    })
 
-        elif action == "modified_file":
-            projects[project]["files_modified"].append({
-                "file": e.get("file", ""),
-                "path": e.get("path", ""),
-                "time": ts,
-            })
-
-        # Task planning — from both old TodoWrite and new TaskCreate
-        elif action == "planned_tasks":
-            tasks = e.get("tasks", [])
-            completed = e.get("completed", [])
-            projects[project]["tasks_planned"].extend(tasks)
-            projects[project]["tasks_completed"].extend(completed)
-        elif action == "task_planned":
-            task = e.get("task", "")
-            if task:
-                projects[project]["plans"].append(task)
+def _on_delegated(p, e, ts):
+    get = e.get
+    task = get("task", "")
+    p.delegated.append({
+        "type": get("agent", ""),
+        "description": task,
+        "prompt": task,
+        "time": ts,
+    })
 
-        # Task completion — from TaskUpdate
-        elif action == "task_completed":
-            projects[project]["completion_count"] += 1
-
-        # Commands — from both old activity-logger and new sync
-        elif action in ("ran_tests", "built_project", "installed_deps", "committed_code",
-                       "git_operation", "infra_operation", "ran_command", "command"):
-            projects[project]["commands"].append({
-                "action": action,
-                "command": e.get("command", ""),
-                "description": e.get("description", ""),
-                "category": e.get("category", ""),
-                "time": ts,
-            })
-            if e.get("category"):
-                projects[project]["categories"].add(e["category"])
-
-        # Research — from both old and new formats
-        elif action == "researched":
-            projects[project]["research"].append({
-                "query": e.get("query", ""),
-                "time": ts,
-            })
-        elif action == "research":
-            projects[project]["research_count"] += 1
-        elif action == "web_research":
-            projects[project]["web_research_count"] += 1
-
-        # Delegated work — from both old and new formats
-        elif action == "delegated_task":
-            projects[project]["delegated"].append({
-                "type": e.get("task_type", ""),
-                "description": e.get("task_description", ""),
-                "prompt": e.get("task_prompt", ""),
-                "time": ts,
-            })
-        elif action == "delegated":
-            projects[project]["delegated"].append({
-                "type": e.get("agent", ""),
-                "description": e.get("task", ""),
-                "prompt": e.get("task", ""),
-                "time": ts,
-            })
-
-        # Track timeline
+# action -> handler(project_agg, event, ts)
+ACTION_HANDLERS = {
+    "user_prompt": _on_user_prompt,
+    "created_file": _on_created_file,
+    "modified_file": _on_modified_file,
+    "planned_tasks": _on_planned_tasks,
+    "task_planned": _on_task_planned,
+    "task_completed": _on_task_completed,
+    "researched": _on_researched,
+    "research": _on_research,
+    "web_research": _on_web_research,
+    "delegated_task": _on_delegated_task,
+    "delegated": _on_delegated,
+    **dict.fromkeys(("ran_tests", "built_project", "installed_deps", "committed_code",
+                     "git_operation", "infra_operation", "ran_command", "command"), _on_command),
+}
+
+def analyze_events(events):
+    """Analyze events into meaningful work summaries.
+
+    Returns (projects, totals): a ProjectAgg per project name and the DayTotals
+    the renderers would otherwise re-derive from them.
+    """
+
+    projects = {}
+    totals = DayTotals()
+    get_handler = ACTION_HANDLERS.get
+
+    for e in events:
+        get = e.get
+        project = get("project", "unknown")
+        ts = get("ts", "")
+
+        p = projects.get(project)
+        if p is None:
+            p = projects[project] = ProjectAgg()
+
+        # Track session and branch
+        session = get("session")
+        if session:
+            p.sessions.add(session)
+        branch = get("branch")
+        if branch and branch != "HEAD":
+            p.branches.add(branch)
+
+        handler = get_handler(get("action", ""))
+        if handler:
+            handler(p, e, ts)
+
+        # Track time span
         if ts:
-            projects[project]["timeline"].append(ts)
+            p.event_count += 1
+            if p.first_ts is None or ts < p.first_ts:
+                p.first_ts = ts
+            if p.last_ts is None or ts > p.last_ts:
+                p.last_ts = ts
 
-    return dict(projects)
+    for p in projects.values():
+        totals.files_created += len(p.files_created)
+        totals.files_modified += len(p.files_modified)
+        totals.tasks_completed += len(p.tasks_completed)
+        totals.completed += p.completion_count
+        totals.planned += len(p.plans)
+        if p.files_created or p.files_modified or p.plans:
+            totals.active_projects += 1
+        if p.event_count:
+            totals.event_count += p.event_count
+            if totals.first_ts is None or p.first_ts < totals.first_ts:
+                totals.first_ts = p.first_ts
+            if totals.last_ts is None or p.last_ts > totals.last_ts:
+                totals.last_ts = p.last_ts
+    totals.completed += totals.tasks_completed
+
+    return projects, totals
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -320,8 +754,9 @@ def extract_intent(user_intents):
             if text.startswith("~/") or text.startswith("/"):
                 # Try multiple strategies to find the meaningful part
                 best = text
-                for sep in [' use ', ' apply ', ' and use ', ' is the ', ' - ']:
-                    idx = text.lower().find(sep)
+                lowered = text.lower()
+                for sep in (' use ', ' apply ', ' and use ', ' is the ', ' - '):
+                    idx = lowered.find(sep)
                     if 0 < idx < 80:
                         candidate = text[idx + len(sep):]
                         if len(candidate) > 20:
@@ -342,7 +777,7 @@ def extract_arc_description(data):
     Prioritizes what was built over raw prompts."""
 
     # Primary: describe what was delivered (interesting groups first)
-    deliverables = group_deliverables(data.get("files_created", []))
+    deliverables = project_deliverables(data)
     if deliverables:
         # Push generic groups to the end
         generic = {'Documentation', 'Configuration', 'Code'}
@@ -359,7 +794,7 @@ def extract_arc_description(data):
         return desc
 
     # Secondary: describe what was modified
-    files_modified = data.get("files_modified", [])
+    files_modified = data.files_modified
     if files_modified:
         unique = list(dict.fromkeys(f["file"] for f in files_modified))
         if len(unique) == 1:
@@ -367,8 +802,8 @@ def extract_arc_description(data):
         return f"refined {len(unique)} files"
 
     # Tertiary: use plans
-    if data.get("plans"):
-        plan = data["plans"][0]
+    if data.plans:
+        plan = data.plans[0]
         if len(plan) > 50:
             return plan[:50].rsplit(" ", 1)[0] + "..."
         return plan
@@ -376,21 +811,43 @@ def extract_arc_description(data):
     return "activity"
 
 
-def get_duration_str(timeline):
-    """Convert timeline to human-friendly duration string."""
-    if not timeline or len(timeline) < 2:
+def wrap_words(words, width, indent=""):
+    """Greedily wrap words into indented lines of at most `width` characters.
+
+    Each line's words are joined once, rather than re-concatenating the line
+    per word. Lines are measured with a trailing space's worth of slack, as
+    the journal has always wrapped.
+    """
+    lines = []
+    line = []
+    length = len(indent)
+    for word in words:
+        if length + len(word) + 1 > width:
+            lines.append(indent + " ".join(line))
+            line = [word]
+            length = len(indent) + len(word)
+        else:
+            length += len(word) + 1 if line else len(word)
+            line.append(word)
+    if line:
+        lines.append(indent + " ".join(line))
+    return lines
+
+
+def clock_minutes(ts):
+    """Minutes past midnight of an "HH:MM" or "HH:MM:SS" timestamp, padded or not."""
+    hours, minutes = ts.split(":", 2)[:2]
+    return int(hours) * 60 + int(minutes)
+
+
+def get_duration_str(agg):
+    """Convert an aggregate's first → last time span to human-friendly duration string."""
+    if agg.event_count < 2:
         return None
-    times = sorted(timeline)
-    start, end = times[0], times[-1]
+    start, end = agg.first_ts, agg.last_ts
     try:
-        # Handle HH:MM and HH:MM:SS formats
-        start_parts = start.split(":")
-        end_parts = end.split(":")
-        start_mins = int(start_parts[0]) * 60 + int(start_parts[1])
-        end_mins = int(end_parts[0]) * 60 + int(end_parts[1])
-        total = end_mins - start_mins
-        if total < 0:
-            total += 24 * 60
+        # Wraps past midnight
+        total = (clock_minutes(end) - clock_minutes(start)) % (24 * 60)
         if total < 60:
             return f"{total}m"
         hours = total // 60
@@ -400,22 +857,49 @@ def get_duration_str(timeline):
         return None
 
 
-def get_time_range_short(timeline):
-    """Get start → end time in short format."""
-    if not timeline:
+def get_time_range_short(agg):
+    """Get an aggregate's start → end time in short format."""
+    if not agg.event_count:
         return "no activity", "", ""
-    times = sorted(timeline)
-    start, end = times[0], times[-1]
+    start, end = agg.first_ts, agg.last_ts
     # Truncate to HH:MM
     return f"{start[:5]} → {end[:5]}", start[:5], end[:5]
 
 
+# Path markers of deliverable groups, in priority order. The lookahead lets
+# one scan report every marker in a path, even where two share a slash.
+DELIVERABLE_PATH_RE = re.compile(
+    r"(?=(?P<storybook>\.storybook)|(?P<tests>__tests?__)|(?P<stories>__stories__)"
+    r"|(?P<openspec>/openspec/)|(?P<services>/services/)|(?P<docs>/docs/)"
+    r"|(?P<composables>/composables/)|(?P<api>/api/))"
+)
+DELIVERABLE_PATH_GROUPS = {
+    "storybook": "Storybook setup",
+    "tests": "Test suites",
+    "stories": "Component stories",
+    "openspec": "OpenSpec artifacts",
+    "docs": "Documentation",
+    "composables": "Frontend composables",
+    "api": "API layer",
+}
+_PATH_MARKER_RANK = {name: i for i, name in enumerate(DELIVERABLE_PATH_RE.groupindex)}
+
+# suffix -> (group, strip the suffix from the shown name)
+DELIVERABLE_SUFFIXES = {
+    ".RfxChain": ("FX Chain presets", True),
+    ".RTrackTemplate": ("Track templates", True),
+    ".RPP": ("Session templates", False),
+    ".ini": ("Configuration", False),
+}
+_DELIVERABLE_SUFFIX_TUPLE = tuple(DELIVERABLE_SUFFIXES)
+
 def group_deliverables(files_created):
     """Group created files into meaningful deliverables by purpose."""
     groups = defaultdict(list)
 
     # Skip temp/noise files
     skip_patterns = ['.tmp.', 'package.tmp', '.bak', '.keep']
+    rank = _PATH_MARKER_RANK.__getitem__
 
     for f in files_created:
         path = f.get("path", "")
@@ -424,21 +908,18 @@ def group_deliverables(files_created):
 
         if not filename:
             continue
-        if any(s in filename.lower() for s in skip_patterns):
+        if any(s in f["file_lc"] for s in skip_patterns):
             continue
 
         # Group by patterns in path and filename
-        path_lower = path.lower()
-
-        if '.storybook' in path_lower:
-            groups["Storybook setup"].append(filename)
-        elif '__tests__' in path_lower or '__test__' in path_lower:
-            groups["Test suites"].append(filename)
-        elif '__stories__' in path_lower or filename.endswith('.stories.js'):
-            groups["Component stories"].append(filename)
-        elif '/openspec/' in path_lower:
-            groups["OpenSpec artifacts"].append(filename)
-        elif '/services/' in path_lower:
+        marker = min((m.lastgroup for m in DELIVERABLE_PATH_RE.finditer(f["path_lc"])),
+                     key=rank, default=None)
+        if filename.endswith('.stories.js') and (marker is None or rank(marker) > rank("stories")):
+            marker = "stories"
+        if marker == "api" and category not in ('route', 'code', 'test'):
+            marker = None
+
+        if marker == "services":
             parts = path.split('/')
             try:
                 idx = [p.lower() for p in parts].index('services')
@@ -446,20 +927,12 @@ def group_deliverables(files_created):
                 groups[f"Service: {svc}"].append(filename)
             except ValueError:
                 groups["Services"].append(filename)
-        elif '/docs/' in path_lower:
-            groups["Documentation"].append(filename)
-        elif '/composables/' in path_lower:
-            groups["Frontend composables"].append(filename)
-        elif '/api/' in path_lower and category in ('route', 'code', 'test'):
-            groups["API layer"].append(filename)
-        elif filename.endswith('.RfxChain'):
-            groups["FX Chain presets"].append(filename.replace('.RfxChain', ''))
-        elif filename.endswith('.RTrackTemplate'):
-            groups["Track templates"].append(filename.replace('.RTrackTemplate', ''))
-        elif filename.endswith('.RPP'):
-            groups["Session templates"].append(filename)
-        elif filename.endswith('.ini'):
-            groups["Configuration"].append(filename)
+        elif marker:
+            groups[DELIVERABLE_PATH_GROUPS[marker]].append(filename)
+        elif filename.endswith(_DELIVERABLE_SUFFIX_TUPLE):
+            suffix = filename[filename.rindex('.'):]
+            group, strip = DELIVERABLE_SUFFIXES[suffix]
+            groups[group].append(filename.replace(suffix, '') if strip else filename)
         elif filename == '.env.local':
             groups["Configuration"].append(filename)
         elif category == 'test' and not filename.endswith('.md'):
@@ -477,50 +950,67 @@ def group_deliverables(files_created):
     return {k: list(dict.fromkeys(v)) for k, v in groups.items()}
 
 
+def project_deliverables(data):
+    """group_deliverables() of a project's created files, grouped once per project.
+
+    The summary, the arc and the journal each describe the same deliverables;
+    the files don't change once the events are analyzed.
+    """
+    if data.deliverables is None:
+        data.deliverables = group_deliverables(data.files_created)
+    return data.deliverables
+
+
 def detect_patterns(data):
     """Detect engineering patterns worth highlighting."""
     patterns = []
 
-    files_created = data.get("files_created", [])
-    commands = data.get("commands", [])
-    plans = data.get("plans", [])
-    completion_count = data.get("completion_count", 0)
-    research_count = data.get("research_count", 0)
-    web_research_count = data.get("web_research_count", 0)
-    delegated = data.get("delegated", [])
+    files_created = data.files_created
+    commands = data.commands
+    plans = data.plans
+    completion_count = data.completion_count
+    research_count = data.research_count
+    web_research_count = data.web_research_count
+    delegated = data.delegated
+
+    # One pass over files and one over commands collects every signal below
+    test_files = 0
+    spec_names = set()
+    safety_files = False
+    for f in files_created:
+        fname = f["file_lc"]
+        if 'spec' in fname or 'test' in fname:
+            test_files += 1
+        # Spec-driven: only count actual design docs, not test spec files
+        is_doc = fname.endswith('.md') or '/openspec/' in f["path_lc"]
+        if is_doc and any(s in fname for s in ('spec', 'design', 'proposal', 'playbook')):
+            spec_names.add(fname)
+        if 'pre-commit' in fname or '.github/workflows' in fname:
+            safety_files = True
+
+    test_commands = 0
+    safety_commands = False
+    for c in commands:
+        cmd = c["command_lc"]
+        if 'test' in cmd or 'jest' in cmd:  # 'test' also covers vitest
+            test_commands += 1
+        if 'detect-secrets' in cmd or 'trufflehog' in cmd or 'pre-commit' in cmd:
+            safety_commands = True
 
     # TDD: tests created + test commands present
-    test_files = [f for f in files_created if 'spec' in f.get("file", "").lower()
-                  or 'test' in f.get("file", "").lower()]
-    test_commands = [c for c in commands if 'test' in c.get("command", "").lower()
-                     or 'vitest' in c.get("command", "").lower()
-                     or 'jest' in c.get("command", "").lower()]
     if test_files and test_commands:
-        patterns.append(("test_driven", f"TDD approach — {len(test_files)} test files, verified with {len(test_commands)} test runs"))
+        patterns.append(("test_driven", f"TDD approach — {test_files} test files, verified with {test_commands} test runs"))
 
     # Spec-driven: design/proposal doc files created (not test .spec.js files)
-    spec_names = set()
-    for f in files_created:
-        fname = f.get("file", "").lower()
-        fpath = f.get("path", "").lower()
-        # Only count actual design docs, not test spec files
-        is_doc = fname.endswith('.md') or '/openspec/' in fpath
-        is_design = any(s in fname for s in ['spec', 'design', 'proposal', 'playbook'])
-        if is_doc and is_design:
-            spec_names.add(fname)
     if len(spec_names) >= 3:
         patterns.append(("spec_driven", f"Spec-driven — designed before building ({len(spec_names)} spec artifacts)"))
 
     # Research-heavy
-    total_research = research_count + web_research_count + len(data.get("research", []))
+    total_research = research_count + web_research_count + len(data.research)
     if total_research > 20:
         patterns.append(("research_driven", f"Research-driven — {total_research} investigations before building"))
 
     # Safety-conscious — must have actual safety tooling, not just specs
-    safety_files = [f for f in files_created if any(s in f.get("file", "").lower()
-                    for s in ['pre-commit', '.github/workflows'])]
-    safety_commands = [c for c in commands if any(s in c.get("command", "").lower()
-                       for s in ['detect-secrets', 'trufflehog', 'pre-commit'])]
     if safety_files or safety_commands:
         patterns.append(("safety_first", "Safety-first — secret scanning, CI pipeline, env validation"))
 
@@ -543,15 +1033,18 @@ def detect_patterns(data):
 # JOURNAL HELPERS
 # ═══════════════════════════════════════════════════════════════════════════════
 
+# "(tasks X.X-X.X)" and "(task X.X)" suffixes
+TASK_RANGE_SUFFIX_RE = re.compile(r'\s*\(tasks?\s+[\d.,\s-]+\)\s*$')
+# Procedural prefixes — we care about what, not the verb
+TASK_VERB_PREFIX_RE = re.compile(r'^(Implement|Create|Set up|Configure|Verify|Install|Run|Add)\s+', re.IGNORECASE)
+# "Section N: " prefix
+TASK_SECTION_PREFIX_RE = re.compile(r'^Sections?\s+[\d-]+:\s*')
+
 def _clean_task_name(name):
     """Strip verbose suffixes from task names to get the product intent."""
-    import re
-    # Remove "(tasks X.X-X.X)" and "(task X.X)" suffixes
-    name = re.sub(r'\s*\(tasks?\s+[\d.,\s-]+\)\s*$', '', name)
-    # Remove procedural prefixes — we care about what, not the verb
-    name = re.sub(r'^(Implement|Create|Set up|Configure|Verify|Install|Run|Add)\s+', '', name, flags=re.IGNORECASE)
-    # Remove "Section N: " prefix
-    name = re.sub(r'^Sections?\s+[\d-]+:\s*', '', name)
+    name = TASK_RANGE_SUFFIX_RE.sub('', name)
+    name = TASK_VERB_PREFIX_RE.sub('', name)
+    name = TASK_SECTION_PREFIX_RE.sub('', name)
     return name.strip()
 
 
@@ -563,12 +1056,17 @@ def _truncate_word(text, limit):
     return truncated
 
 
+# Task names mentioning a file are paths, not product intent
+TASK_FILE_EXTS = ('.py', '.js', '.ts', '.json', '.toml', '.ini', '.md', '.yaml')
+# Whole words that mark a task name as a leftover sentence fragment
+FRAGMENT_WORDS = frozenset({'is', 'are', 'was', 'were', 'not', 'from', 'that'})
+
 def generate_product_description(data):
     """Generate 2-3 lines of human-readable product description from deliverables/tasks."""
     lines = []
 
     # Strategy 1: Use task names if available (they describe intent better)
-    plans = data.get("plans", [])
+    plans = data.plans
     if plans:
         cleaned = [_clean_task_name(p) for p in plans]
         # Filter: discard fragments (too short, procedural, file names)
@@ -577,13 +1075,13 @@ def generate_product_description(data):
             if len(c) < 5:
                 continue
             # Skip file names and paths
-            if any(ext in c for ext in ['.py', '.js', '.ts', '.json', '.toml', '.ini', '.md', '.yaml']):
+            if any(ext in c for ext in TASK_FILE_EXTS):
                 continue
             # Skip lowercase fragments (verb remnants after prefix stripping)
             if c[0].islower():
                 continue
             # Skip sentence fragments (verb phrases left after stripping)
-            if any(f' {w} ' in f' {c} ' for w in ['is', 'are', 'was', 'were', 'not', 'from', 'that']):
+            if not FRAGMENT_WORDS.isdisjoint(c.split(' ')):
                 continue
             good.append(c)
 
@@ -612,7 +1110,7 @@ def generate_product_description(data):
             return lines[:3]
 
     # Strategy 2: Use deliverable group names
-    deliverables = group_deliverables(data.get("files_created", []))
+    deliverables = project_deliverables(data)
     if deliverables:
         generic = {'Documentation', 'Configuration', 'Code'}
         groups = [g for g in deliverables if g not in generic] + \
@@ -633,7 +1131,7 @@ def generate_product_description(data):
         return lines
 
     # Strategy 3: Describe modifications
-    files_modified = data.get("files_modified", [])
+    files_modified = data.files_modified
     if files_modified:
         unique = list(dict.fromkeys(f["file"] for f in files_modified))
         if len(unique) <= 3:
@@ -647,35 +1145,34 @@ def generate_metrics_line(data):
     """Generate a compact metrics one-liner for a project."""
     parts = []
 
-    plans = data.get("plans", [])
-    completion_count = data.get("completion_count", 0)
-    old_completed = list(set(data.get("tasks_completed", [])))
-    total_completed = completion_count + len(old_completed)
+    plans = data.plans
+    completion_count = data.completion_count
+    total_completed = completion_count + len(data.tasks_completed)
 
     if plans and total_completed > 0:
         parts.append(f"{total_completed}/{len(plans)} tasks")
     elif total_completed > 0:
         parts.append(f"{total_completed} tasks")
 
-    test_commands = [c for c in data.get("commands", [])
-                     if any(t in c.get("command", "").lower()
+    test_commands = [c for c in data.commands
+                     if any(t in c["command_lc"]
                             for t in ["test", "vitest", "jest", "pytest"])]
     if test_commands:
         parts.append(f"{len(test_commands)} test runs")
 
-    delegated = data.get("delegated", [])
+    delegated = data.delegated
     if len(delegated) >= 3:
         parts.append(f"{len(delegated)} agents")
 
-    git_commits = [c for c in data.get("commands", [])
-                   if "commit" in c.get("command", "").lower()
+    git_commits = [c for c in data.commands
+                   if "commit" in c["command_lc"]
                    and c.get("action") in ("committed_code", "command", "git_operation")]
     if git_commits:
         parts.append(f"{len(git_commits)} commits")
 
     if not parts:
-        created = len(data.get("files_created", []))
-        modified = len(data.get("files_modified", []))
+        created = len(data.files_created)
+        modified = len(data.files_modified)
         if created:
             parts.append(f"{created} files created")
         if modified:
@@ -688,16 +1185,16 @@ def rank_projects(projects):
     """Rank projects by substance. Returns (expanded_list, collapsed_list)."""
     scored = []
     for name, data in projects.items():
-        has_substance = (data["files_created"] or data["files_modified"]
-                        or data.get("plans") or data.get("user_intents")
-                        or data.get("completion_count", 0) > 0)
-        if not data["timeline"] or not has_substance:
+        has_substance = (data.files_created or data.files_modified
+                        or data.plans or data.user_intents
+                        or data.completion_count > 0)
+        if not data.event_count or not has_substance:
             continue
 
-        score = (len(data["files_created"]) * 2
-                 + data.get("completion_count", 0) * 3
-                 + len(set(data.get("tasks_completed", []))) * 3
-                 + len(data["timeline"]))
+        score = (len(data.files_created) * 2
+                 + data.completion_count * 3
+                 + len(data.tasks_completed) * 3
+                 + data.event_count)
         scored.append((name, data, score))
 
     scored.sort(key=lambda x: -x[2])
@@ -707,25 +1204,19 @@ def rank_projects(projects):
     return expanded, collapsed
 
 
-def compute_vibes(projects, events, date_str):
-    """Compute the vibes section: energy, focus, highlight, method, cost."""
-    import re
+def compute_vibes(projects, totals, events, date_str, project=None):
+    """Compute the vibes section: energy, focus, highlight, method, cost.
+
+    With `project`, events are that project's alone, but the cost is still
+    the day's total and is labelled so.
+    """
     vibes = {}
 
     # Energy — based on time span
-    all_times = []
-    for p in projects.values():
-        all_times.extend(p["timeline"])
-    if all_times:
-        duration_str = get_duration_str(all_times)
-        times = sorted(all_times)
+    if totals.event_count:
+        duration_str = get_duration_str(totals)
         try:
-            start_parts = times[0].split(":")
-            end_parts = times[-1].split(":")
-            total_mins = (int(end_parts[0]) * 60 + int(end_parts[1])) - \
-                         (int(start_parts[0]) * 60 + int(start_parts[1]))
-            if total_mins < 0:
-                total_mins += 24 * 60
+            total_mins = (clock_minutes(totals.last_ts) - clock_minutes(totals.first_ts)) % (24 * 60)
             hours = total_mins / 60
 
             if hours < 4:
@@ -738,7 +1229,7 @@ def compute_vibes(projects, events, date_str):
                 label = "marathon"
 
             bar_filled = min(int(hours / 24 * 22), 22)
-            bar = "█" * bar_filled + "░" * (22 - bar_filled)
+            bar = BAR_FULL[:bar_filled] + BAR_EMPTY[:22 - bar_filled]
             vibes["energy"] = f"{bar}  {label} ({duration_str} span)"
         except:
             vibes["energy"] = "unknown"
@@ -747,10 +1238,9 @@ def compute_vibes(projects, events, date_str):
 
     # Focus — project count + completion
     active = [(n, d) for n, d in projects.items()
-              if d["files_created"] or d["files_modified"] or d.get("plans")]
-    total_planned = sum(len(d.get("plans", [])) for d in projects.values())
-    total_completed = sum(d.get("completion_count", 0) for d in projects.values())
-    total_completed += sum(len(set(d.get("tasks_completed", []))) for d in projects.values())
+              if d.files_created or d.files_modified or d.plans]
+    total_planned = totals.planned
+    total_completed = totals.completed
 
     if len(active) == 1:
         focus = f"deep focus on {active[0][0]}"
@@ -771,7 +1261,7 @@ def compute_vibes(projects, events, date_str):
 
     # Highlight — largest project by time, described
     if active:
-        biggest = max(active, key=lambda x: len(x[1]["timeline"]))
+        biggest = max(active, key=lambda x: x[1].event_count)
         desc = extract_arc_description(biggest[1])
         vibes["highlight"] = f"{biggest[0]} — {desc}"
     else:
@@ -818,6 +1308,8 @@ def compute_vibes(projects, events, date_str):
             for model, m_stats in sorted(by_model.items(), key=lambda x: -x[1].get("cost", 0)):
                 model_parts.append(f"{model} ${m_stats['cost']:.0f}")
             vibes["cost"] = f"{cost} · {' / '.join(model_parts[:2])}"
+            if project:
+                vibes["cost"] += " · all projects"
         else:
             vibes["cost"] = "no data for today"
     else:
@@ -830,21 +1322,34 @@ def compute_vibes(projects, events, date_str):
 # RENDERING
 # ═══════════════════════════════════════════════════════════════════════════════
 
+# Line prefixes for list items under a project
+BULLET = "      • "
+CHECK = "      ✓ "
+
+PATTERN_ICONS = {
+    "test_driven": "🧪",
+    "spec_driven": "📐",
+    "research_driven": "🔬",
+    "safety_first": "🔒",
+    "parallel_work": "⚡",
+    "all_shipped": "🚀",
+    "progress": "📊",
+}
+
 def render_project_summary(name, data):
     """Render a single project's narrative summary."""
     lines = []
 
     # Project header with work time and branch
-    timeline = data["timeline"]
-    time_span, start_time, end_time = get_time_range_short(timeline)
-    duration = get_duration_str(timeline)
-    branches = data.get("branches", set())
+    time_span, start_time, end_time = get_time_range_short(data)
+    duration = get_duration_str(data)
+    branches = data.branches
 
     # Show backfill indicator
-    source_label = " (from session history)" if data.get("has_backfill") else ""
+    source_label = " (from session history)" if data.has_backfill else ""
 
-    lines.append(f"")
-    lines.append(f"┌{'─' * 76}┐")
+    lines.append("")
+    lines.append(BOX_TOP)
     lines.append(f"│  📁 {name:<50} [{time_span:>17}] │")
     if branches:
         branch_str = ", ".join(branches)
@@ -854,38 +1359,30 @@ def render_project_summary(name, data):
         lines.append(f"│  {'':54} ⏱️  {duration:>15} │")
     if source_label:
         lines.append(f"│  {source_label:<74} │")
-    lines.append(f"└{'─' * 76}┘")
+    lines.append(BOX_BOTTOM)
 
     # For backfilled data, show prompts instead of detailed tool usage
-    if data.get("has_backfill"):
-        prompts = data["prompts"]
+    if data.has_backfill:
+        prompts = data.prompts
         if prompts:
-            lines.append(f"")
-            lines.append(f"  📝 SESSION ACTIVITY:")
+            lines.append("")
+            lines.append("  📝 SESSION ACTIVITY:")
             for p in prompts[:8]:
-                prompt_text = p["prompt"][:65] + "..." if len(p["prompt"]) > 65 else p["prompt"]
+                prompt_text = p["prompt"]
+                if len(prompt_text) > 65:
+                    prompt_text = f"{prompt_text[:65]}..."
                 if prompt_text:
-                    lines.append(f"      • {prompt_text}")
+                    lines.append(BULLET + prompt_text)
             if len(prompts) > 8:
                 lines.append(f"      ... and {len(prompts) - 8} more sessions")
-        return "\n".join(lines)
+        return lines
 
     # Intent — what the user set out to do
-    intent = extract_intent(data.get("user_intents", []))
+    intent = extract_intent(data.user_intents)
     if intent:
         # Word-wrap the intent at ~60 chars for display
-        words = intent.split()
-        intent_lines = []
-        current_line = ""
-        for word in words:
-            if len(current_line) + len(word) + 1 > 62:
-                intent_lines.append(current_line)
-                current_line = word
-            else:
-                current_line = f"{current_line} {word}" if current_line else word
-        if current_line:
-            intent_lines.append(current_line)
-        lines.append(f"")
+        intent_lines = wrap_words(intent.split(), 62)
+        lines.append("")
         lines.append(f"  💬 \"{intent_lines[0]}")
         for il in intent_lines[1:]:
             lines.append(f"      {il}")
@@ -895,15 +1392,15 @@ def render_project_summary(name, data):
             lines[-1] += "\""
 
     # Deliverables — grouped by purpose, interesting work first
-    files_created = data["files_created"]
+    files_created = data.files_created
     if files_created:
-        deliverables = group_deliverables(files_created)
+        deliverables = project_deliverables(data)
         # Reorder: interesting/unique groups first, generic last
         generic = {'Documentation', 'Configuration', 'Code'}
         sorted_groups = [(k, v) for k, v in deliverables.items() if k not in generic] + \
                         [(k, v) for k, v in deliverables.items() if k in generic]
-        lines.append(f"")
-        lines.append(f"  🎯 DELIVERED:")
+        lines.append("")
+        lines.append("  🎯 DELIVERED:")
         for group_name, files in sorted_groups:
             if len(files) == 1:
                 lines.append(f"      {group_name} — {files[0]}")
@@ -915,10 +1412,10 @@ def render_project_summary(name, data):
                 lines.append(f"      {group_name} — {len(files)} files ({preview}, ...)")
 
     # Modified files — compact
-    files_modified = data["files_modified"]
+    files_modified = data.files_modified
     if files_modified:
         unique_files = list(dict.fromkeys(f["file"] for f in files_modified))
-        lines.append(f"")
+        lines.append("")
         if len(unique_files) <= 6:
             file_list = ", ".join(unique_files)
             lines.append(f"  ✏️  REFINED: {file_list}")
@@ -928,71 +1425,54 @@ def render_project_summary(name, data):
             lines.append(f"      +{len(unique_files) - 5} more files touched")
 
     # Task completion — the achievement story
-    plans = data.get("plans", [])
-    completion_count = data.get("completion_count", 0)
-    # Also check old-style tasks
-    old_completed = list(set(data.get("tasks_completed", [])))
-    old_planned = list(set(data.get("tasks_planned", [])))
+    plans = data.plans
+    completion_count = data.completion_count
+    # Also check old-style tasks, deduplicated in the order they were logged
+    old_completed = list(data.tasks_completed)
 
     if plans and completion_count > 0:
         if completion_count >= len(plans):
-            lines.append(f"")
+            lines.append("")
             lines.append(f"  ✅ ALL {completion_count} TASKS COMPLETED:")
         else:
-            lines.append(f"")
+            lines.append("")
             lines.append(f"  ✅ {completion_count}/{len(plans)} TASKS COMPLETED:")
-        for p in plans:
-            lines.append(f"      ✓ {p}")
+        lines.extend(CHECK + p for p in plans)
     elif old_completed:
-        lines.append(f"")
-        lines.append(f"  ✅ COMPLETED:")
-        for t in old_completed[:8]:
-            lines.append(f"      ✓ {t}")
+        lines.append("")
+        lines.append("  ✅ COMPLETED:")
+        lines.extend(CHECK + t for t in old_completed[:8])
 
     # Engineering patterns — the interesting bits
     patterns = detect_patterns(data)
     if patterns:
-        lines.append(f"")
-        pattern_icons = {
-            "test_driven": "🧪",
-            "spec_driven": "📐",
-            "research_driven": "🔬",
-            "safety_first": "🔒",
-            "parallel_work": "⚡",
-            "all_shipped": "🚀",
-            "progress": "📊",
-        }
+        lines.append("")
         for pattern_key, description in patterns:
             if pattern_key not in ("all_shipped", "progress"):  # Skip — already shown in tasks
-                icon = pattern_icons.get(pattern_key, "✨")
+                icon = PATTERN_ICONS.get(pattern_key, "✨")
                 lines.append(f"  {icon} {description}")
 
-    return "\n".join(lines)
+    return lines
 
-def render_day_narrative(projects, date_str):
+def render_day_narrative(projects, totals, date_str):
     """Generate a narrative summary of the day — the story arc."""
     lines = []
 
-    total_files_created = sum(len(p["files_created"]) for p in projects.values())
-    total_files_modified = sum(len(p["files_modified"]) for p in projects.values())
-    total_completed = sum(p.get("completion_count", 0) for p in projects.values())
-    total_completed += sum(len(set(p.get("tasks_completed", []))) for p in projects.values())
+    total_files_created = totals.files_created
+    total_files_modified = totals.files_modified
+    total_completed = totals.completed
 
     # Compute overall time span
-    all_times = []
-    for p in projects.values():
-        all_times.extend(p["timeline"])
-    overall_duration = get_duration_str(all_times) if all_times else None
-    time_range, start_t, end_t = get_time_range_short(all_times)
+    overall_duration = get_duration_str(totals)
+    time_range, start_t, end_t = get_time_range_short(totals)
 
     # Count projects with real activity
-    active_projects = sum(1 for p in projects.values()
-                         if p["files_created"] or p["files_modified"] or p["plans"])
+    active_projects = totals.active_projects
 
     lines.append("")
-    lines.append("┌" + "─" * 76 + "┐")
+    lines.append(BOX_TOP)
     lines.append("│" + " " * 29 + "☕ TODAY'S SESSION" + " " * 30 + "│")
-    lines.append("├" + "─" * 76 + "┤")
+    lines.append(BOX_MID)
 
     # Time and overall stats
     time_line = f"│  {time_range}"
@@ -1005,14 +1485,14 @@ def render_day_narrative(projects, date_str):
     stats = stats + " " * (77 - len(stats)) + "│"
     lines.append(stats)
 
-    lines.append("└" + "─" * 76 + "┘")
+    lines.append(BOX_BOTTOM)
 
     # Story arc — timeline of projects
     sorted_projects = sorted(
         ((name, data) for name, data in projects.items()
-         if data["timeline"] and (data["files_created"] or data["files_modified"]
-                                  or data.get("plans") or data.get("user_intents"))),
-        key=lambda x: min(x[1]["timeline"])
+         if data.event_count and (data.files_created or data.files_modified
+                                  or data.plans or data.user_intents)),
+        key=lambda x: x[1].first_ts
     )
 
     if sorted_projects:
@@ -1020,43 +1500,44 @@ def render_day_narrative(projects, date_str):
         lines.append("  📖 THE ARC:")
 
         for name, data in sorted_projects:
-            _, proj_start, _ = get_time_range_short(data["timeline"])
+            _, proj_start, _ = get_time_range_short(data)
             desc = extract_arc_description(data)
             lines.append(f"  {proj_start}  {name} — {desc}")
 
-    return "\n".join(lines)
+    return lines
+
+def render_week_activity(days=7, all_projects=False):
+    """Show activity across the week.
 
-def render_week_activity(days=7):
-    """Show activity across the week."""
+    Counts always cover every project; `all_projects` says so under the
+    header for views filtered to one project.
+    """
     lines = []
     today = datetime.now()
 
     lines.append("")
-    lines.append("┌" + "─" * 76 + "┐")
+    lines.append(BOX_TOP)
     lines.append("│" + " " * 30 + "📅 THIS WEEK" + " " * 34 + "│")
-    lines.append("└" + "─" * 76 + "┘")
+    lines.append(BOX_BOTTOM)
+    if all_projects:
+        lines.append("  All projects")
     lines.append("")
 
-    week_data = []
-    for i in range(days - 1, -1, -1):
-        day = today - timedelta(days=i)
-        date_str = day.strftime("%Y-%m-%d")
-        day_name = day.strftime("%a")
-        events = load_logs(date_str)
-
-        # Count meaningful events
-        meaningful = [e for e in events if e.get("action") in
-                     ("created_file", "modified_file", "committed_code", "ran_tests", "built_project")]
-        week_data.append((day_name, date_str, len(meaningful), len(events)))
+    week = [today - timedelta(days=i) for i in range(days - 1, -1, -1)]
+    date_strs = [day.strftime("%Y-%m-%d") for day in week]
+    # Count meaningful events
+    week_data = [(day.strftime("%a"), date_str, meaningful, total)
+                 for day, date_str, (meaningful, total) in zip(week, date_strs, count_days(date_strs))]
 
     max_events = max(d[2] for d in week_data) if week_data else 1
+    today_str = today.strftime("%Y-%m-%d")
 
     # Render each day
     for day_name, date_str, meaningful, total in week_data:
         bar_len = int((meaningful / max(max_events, 1)) * 40)
-        bar = "█" * bar_len + "░" * (40 - bar_len)
+        bar = BAR_FULL[:bar_len] + BAR_EMPTY[:40 - bar_len]
 
-        is_today = date_str == today.strftime("%Y-%m-%d")
+        is_today = date_str == today_str
         marker = "→" if is_today else " "
 
         lines.append(f"  {marker} {day_name} │{bar}│ {meaningful:3} actions")
@@ -1073,33 +1554,86 @@ def render_week_activity(days=7):
         lines.append("")
         lines.append(f"  🔥 {streak}-day streak!")
 
-    return "\n".join(lines)
+    return lines
+
+# Filler words ignored when pulling keywords out of prompts
+STOP_WORDS = frozenset({
+    'the', 'and', 'for', 'that', 'this', 'with', 'from', 'have', 'will',
+    'been', 'are', 'was', 'were', 'has', 'had', 'not', 'but', 'all',
+    'can', 'you', 'your', 'our', 'what', 'when', 'how', 'which', 'into',
+    'also', 'just', 'like', 'them', 'than', 'then', 'each', 'make',
+    'way', 'use', 'using', 'about', "it's", "don't", "i'm",
+    'should', 'could', 'would', 'does', 'there', 'here', 'need',
+})
+
+# A whitespace-separated word with leading and trailing punctuation stripped,
+# the same as str.split() then str.strip() of these characters per word
+KEYWORD_TOKEN_RE = re.compile(r"[.,!?\"'()\[\]{}:/~]*(\S+?)[.,!?\"'()\[\]{}:/~]*(?!\S)")
+
+def prompt_keywords(text):
+    """Lowercased words of a prompt worth counting as keywords."""
+    return (w for w in KEYWORD_TOKEN_RE.findall(text.lower()) if len(w) > 3 and w not in STOP_WORDS)
+
+# Impact buckets and their score weights; prompts accumulate plain counts in
+# this order and only the reported top five become dicts
+IMPACT_FIELDS = ("files", "tasks", "commands", "delegated")
+IMPACT_WEIGHTS = (3, 5, 1, 4)
+
+# Which impact bucket (index into IMPACT_FIELDS) each action following a prompt counts toward
+IMPACT_KINDS = {
+    "created_file": 0, "modified_file": 0,
+    "task_completed": 1, "task_planned": 1,
+    "command": 2, "ran_tests": 2, "built_project": 2,
+    "ran_command": 2, "git_operation": 2, "installed_deps": 2,
+    "delegated": 3, "delegated_task": 3,
+}
+
+# (events, sorted copy) of the last chronological() call; holding the list
+# keeps its identity valid for the next caller
+_chronological = (None, None)
+
+def chronological(events):
+    """Events ordered by (session, ts); one render asks several times for the same list."""
+    global _chronological
+    if _chronological[0] is not events:
+        _chronological = (events, sorted(events, key=lambda e: (e.get("session", ""), e.get("ts", ""))))
+    return _chronological[1]
+
+
+# (events, result) of the last analyze_top_prompts() call, like chronological()
+_top_prompts = (None, None)
 
 def analyze_top_prompts(events):
-    """Find the most impactful user prompts by output generated."""
-    NOISE = ['<command-', '<local-command-', '<task-notification>',
-             'This session is being continued', 'Caveat: The messages']
+    """Find the most impactful user prompts by output generated.
+
+    The top-prompts section and the session insights both ask for the same
+    events; the second call reuses the first one's result.
+    """
+    global _top_prompts
+    if _top_prompts[0] is not events:
+        _top_prompts = (events, _analyze_top_prompts(events))
+    return _top_prompts[1]
+
+
+def _analyze_top_prompts(events):
+    get_kind = IMPACT_KINDS.get
 
     prompts_with_impact = []
     current_prompt = None
-    current_impact = {"files": 0, "tasks": 0, "commands": 0, "delegated": 0}
-
-    # Sort events by timestamp for chronological analysis
-    sorted_events = sorted(events, key=lambda e: (e.get("session", ""), e.get("ts", "")))
+    counts = [0, 0, 0, 0]
 
-    for e in sorted_events:
+    for e in chronological(events):
         action = e.get("action", "")
 
         if action == "user_prompt":
             # Save previous prompt's impact
             if current_prompt:
-                total = current_impact["files"] * 3 + current_impact["tasks"] * 5 + \
-                        current_impact["commands"] + current_impact["delegated"] * 4
+                total = sum(map(mul, counts, IMPACT_WEIGHTS))
                 if total > 0:
-                    prompts_with_impact.append((current_prompt, dict(current_impact), total))
+                    prompts_with_impact.append((current_prompt, counts, total))
 
             prompt_text = e.get("prompt", "")
-            if any(s in prompt_text for s in NOISE):
+            if PROMPT_NOISE_RE.search(prompt_text):
                 current_prompt = None
                 continue
 
@@ -1108,55 +1642,66 @@ def analyze_top_prompts(events):
                 "time": e.get("ts", ""),
                 "project": e.get("project", ""),
             }
-            current_impact = {"files": 0, "tasks": 0, "commands": 0, "delegated": 0}
+            counts = [0, 0, 0, 0]
 
         elif current_prompt:
-            if action in ("created_file", "modified_file"):
-                current_impact["files"] += 1
-            elif action in ("task_completed", "task_planned"):
-                current_impact["tasks"] += 1
-            elif action in ("command", "ran_tests", "built_project", "ran_command",
-                           "git_operation", "installed_deps"):
-                current_impact["commands"] += 1
-            elif action in ("delegated", "delegated_task"):
-                current_impact["delegated"] += 1
+            kind = get_kind(action)
+            if kind is not None:
+                counts[kind] += 1
 
     # Don't forget last prompt
     if current_prompt:
-        total = current_impact["files"] * 3 + current_impact["tasks"] * 5 + \
-                current_impact["commands"] + current_impact["delegated"] * 4
+        total = sum(map(mul, counts, IMPACT_WEIGHTS))
         if total > 0:
-            prompts_with_impact.append((current_prompt, dict(current_impact), total))
-
-    # Sort by impact score
-    prompts_with_impact.sort(key=lambda x: -x[2])
-    return prompts_with_impact[:5]
+            prompts_with_impact.append((current_prompt, counts, total))
+
+    # Top 5 by impact score; ties keep chronological order
+    top = heapq.nlargest(5, prompts_with_impact, key=itemgetter(2))
+    return [(prompt, dict(zip(IMPACT_FIELDS, counts)), total) for prompt, counts, total in top]
+
+
+# (style, regex group, keywords): a style applies when any keyword appears
+# anywhere in the top prompts, even inside a longer word
+PROMPT_STYLES = [
+    ("test-oriented", "test", ('test', 'spec', 'vitest', 'jest')),
+    ("systematic", "systematic", ('systematic', 'methodical', 'step')),
+    ("environment-focused", "environment", ('setup', 'install', 'configure')),
+    ("learning-oriented", "learning", ('explain', 'walk', 'understand')),
+    ("safety-conscious", "safety", ('safe', 'security', 'guard')),
+    ("pattern-thinking", "pattern", ('reusable', 're-usable', 'pattern')),
+]
+# One scan for every style; the lookahead reports a match at each position,
+# so keywords overlapping each other are all seen
+PROMPT_STYLE_RE = re.compile("(?=" + "|".join(
+    f"(?P<{group}>{'|'.join(map(re.escape, keywords))})" for _, group, keywords in PROMPT_STYLES
+) + ")")
 
 
 def render_top_prompts(events):
     """Render the most impactful prompts with keyword analysis."""
     top = analyze_top_prompts(events)
     if not top:
-        return ""
+        return []
 
     lines = []
     lines.append("")
-    lines.append("┌" + "─" * 76 + "┐")
+    lines.append(BOX_TOP)
     lines.append("│" + " " * 22 + "🧠 TOP PROMPTS BY IMPACT" + " " * 30 + "│")
-    lines.append("└" + "─" * 76 + "┘")
+    lines.append(BOX_BOTTOM)
 
     for i, (prompt, impact, score) in enumerate(top, 1):
         text = " ".join(prompt["text"].split())
         # Clean up paths for display
         if text.startswith("~/") or text.startswith("/"):
-            for sep in [' use ', ' apply ', ' is the ', ' and ']:
-                idx = text.lower().find(sep)
+            lowered = text.lower()
+            for sep in (' use ', ' apply ', ' is the ', ' and '):
+                idx = lowered.find(sep)
                 if 0 < idx < 80:
                     text = text[idx + len(sep):]
                     break
         if len(text) > 90:
             text = text[:87] + "..."
-        lines.append(f"")
+        lines.append("")
         lines.append(f"  #{i}  [{prompt['time'][:5]}] {prompt['project']}")
         lines.append(f"      \"{text}\"")
 
@@ -1172,56 +1717,30 @@ def render_top_prompts(events):
         lines.append(f"      → {' · '.join(parts)}  (impact: {score})")
 
     # Keyword analysis across top prompts
-    stop_words = {
-        'the', 'and', 'for', 'that', 'this', 'with', 'from', 'have', 'will',
-        'been', 'are', 'was', 'were', 'has', 'had', 'not', 'but', 'all',
-        'can', 'you', 'your', 'our', 'what', 'when', 'how', 'which', 'into',
-        'also', 'just', 'like', 'them', 'than', 'then', 'each', 'make',
-        'way', 'use', 'using', 'about', 'it\'s', 'don\'t', 'i\'m',
-        'should', 'could', 'would', 'does', 'there', 'here', 'need',
-    }
-    all_words = []
+    word_counts = Counter()
     for prompt, _, _ in top:
-        text = prompt["text"].lower()
-        for word in text.split():
-            word = word.strip(".,!?\"'()[]{}:/~")
-            if len(word) > 3 and word not in stop_words and not word.startswith('/'):
-                all_words.append(word)
-
-    from collections import Counter
-    word_counts = Counter(all_words)
+        word_counts.update(prompt_keywords(prompt["text"]))
     top_keywords = word_counts.most_common(10)
 
     if top_keywords:
-        lines.append(f"")
-        lines.append(f"  🔑 PROMPT PATTERNS:")
+        lines.append("")
+        lines.append("  🔑 PROMPT PATTERNS:")
         kw_parts = [f"{word} ({count}x)" for word, count in top_keywords if count > 1]
         if kw_parts:
             lines.append(f"      Recurring: {' · '.join(kw_parts[:6])}")
 
         # Detect prompt engineering patterns
-        patterns = []
         all_text = " ".join(p["text"].lower() for p, _, _ in top)
-        if any(w in all_text for w in ['test', 'spec', 'vitest', 'jest']):
-            patterns.append("test-oriented")
-        if any(w in all_text for w in ['systematic', 'methodical', 'step']):
-            patterns.append("systematic")
-        if any(w in all_text for w in ['setup', 'install', 'configure']):
-            patterns.append("environment-focused")
-        if any(w in all_text for w in ['explain', 'walk', 'understand']):
-            patterns.append("learning-oriented")
-        if any(w in all_text for w in ['safe', 'security', 'guard']):
-            patterns.append("safety-conscious")
-        if any(w in all_text for w in ['reusable', 're-usable', 'pattern']):
-            patterns.append("pattern-thinking")
+        found = {m.lastgroup for m in PROMPT_STYLE_RE.finditer(all_text)}
+        patterns = [style for style, group, _ in PROMPT_STYLES if group in found]
 
         if patterns:
             lines.append(f"      Style: {' · '.join(patterns)}")
 
-    lines.append(f"")
-    lines.append(f"  💡 Expand a prompt: python3 summary.py --prompt 1")
+    lines.append("")
+    lines.append("  💡 Expand a prompt: python3 summary.py --prompt 1")
 
-    return "\n".join(lines)
+    return lines
 
 
 def render_prompt_detail(events, rank):
@@ -1239,13 +1758,13 @@ def render_prompt_detail(events, rank):
                 return f"\n  Invalid rank #{rank}. Available: 1–{len(top)}\n"
             indices = [idx]
         except ValueError:
-            return f"\n  Usage: --prompt 1  or  --prompt all\n"
+            return "\n  Usage: --prompt 1  or  --prompt all\n"
 
     output = []
     output.append("")
-    output.append("┌" + "─" * 76 + "┐")
+    output.append(BOX_TOP)
     output.append("│" + " " * 22 + "🔍 PROMPT DEEP DIVE" + " " * 35 + "│")
-    output.append("└" + "─" * 76 + "┘")
+    output.append(BOX_BOTTOM)
 
     for idx in indices:
         prompt, impact, score = top[idx]
@@ -1258,16 +1777,7 @@ def render_prompt_detail(events, rank):
 
         # Full prompt text, word-wrapped at ~72 chars
         output.append("  PROMPT:")
-        words = text.split()
-        current_line = "    "
-        for word in words:
-            if len(current_line) + len(word) + 1 > 74:
-                output.append(current_line)
-                current_line = "    " + word
-            else:
-                current_line = current_line + " " + word if current_line.strip() else "    " + word
-        if current_line.strip():
-            output.append(current_line)
+        output.extend(wrap_words(text.split(), 74, "    "))
 
         # Impact breakdown
         output.append("")
@@ -1280,25 +1790,11 @@ def render_prompt_detail(events, rank):
             output.append(f"    ▶️  {impact['commands']} command(s) executed         (×1 = {impact['commands']})")
         if impact["delegated"]:
             output.append(f"    ⚡ {impact['delegated']} agent(s) delegated          (×4 = {impact['delegated'] * 4})")
-        output.append(f"    ─────────────────────────────────")
+        output.append("    ─────────────────────────────────")
         output.append(f"    Total impact score: {score}")
 
         # Keyword extraction for this individual prompt
-        stop_words = {
-            'the', 'and', 'for', 'that', 'this', 'with', 'from', 'have', 'will',
-            'been', 'are', 'was', 'were', 'has', 'had', 'not', 'but', 'all',
-            'can', 'you', 'your', 'our', 'what', 'when', 'how', 'which', 'into',
-            'also', 'just', 'like', 'them', 'than', 'then', 'each', 'make',
-            'way', 'use', 'using', 'about', "it's", "don't", "i'm",
-            'should', 'could', 'would', 'does', 'there', 'here', 'need',
-        }
-        from collections import Counter
-        words_clean = []
-        for w in text.lower().split():
-            w = w.strip(".,!?\"'()[]{}:/~")
-            if len(w) > 3 and w not in stop_words and not w.startswith('/'):
-                words_clean.append(w)
-        word_counts = Counter(words_clean)
+        word_counts = Counter(prompt_keywords(text))
         top_kw = word_counts.most_common(8)
         if top_kw:
             output.append("")
@@ -1317,39 +1813,40 @@ def render_prompt_detail(events, rank):
     return "\n".join(output)
 
 
+PRODUCTIVE_ACTIONS = frozenset({"created_file", "modified_file", "task_completed", "task_planned"})
+SLUMP_NOISE = PROMPT_NOISE + ('Your task is to create a detailed summary',)
+SLUMP_NOISE_RE = re.compile("|".join(map(re.escape, SLUMP_NOISE)))
+# Phrases that file a slump under exploration or setup, matched against the lowercased prompt
+SLUMP_EXPLORATION_RE = re.compile("check|explore|research|what is|how to|tell me")
+SLUMP_SETUP_RE = re.compile("setup|install|configure|open")
+
 def analyze_slumps(events):
     """Find periods where prompts produced zero or minimal output — the slumps."""
-    NOISE = ['<command-', '<local-command-', '<task-notification>',
-             'This session is being continued', 'Caveat: The messages',
-             'Your task is to create a detailed summary']
 
-    sorted_events = sorted(events, key=lambda e: (e.get("session", ""), e.get("ts", "")))
     slumps = []
+    # The prompt awaiting output; cleared as soon as anything productive follows
     current_prompt = None
-    impact = 0
 
-    for e in sorted_events:
+    for e in chronological(events):
         action = e.get("action", "")
 
         if action == "user_prompt":
-            if current_prompt and impact == 0:
+            if current_prompt:
                 slumps.append(current_prompt)
             text = e.get("prompt", "")
-            if not any(s in text for s in NOISE) and len(text.strip()) > 20:
+            if not SLUMP_NOISE_RE.search(text) and len(text.strip()) > 20:
                 current_prompt = {
                     "text": text,
                     "time": e.get("ts", ""),
                     "project": e.get("project", ""),
                 }
-                impact = 0
             else:
                 current_prompt = None
-        elif current_prompt:
-            if action in ("created_file", "modified_file", "task_completed", "task_planned"):
-                impact += 1
+        elif current_prompt and action in PRODUCTIVE_ACTIONS:
+            current_prompt = None
 
     # Last one
-    if current_prompt and impact == 0:
+    if current_prompt:
         slumps.append(current_prompt)
 
     return slumps
@@ -1357,42 +1854,62 @@ def analyze_slumps(events):
 
 def analyze_time_gaps(events):
     """Find the biggest time gaps (potential context-switching or thinking pauses)."""
-    times = sorted(set(e.get("ts", "") for e in events if e.get("ts", "")))
+    # One lookup per event; the blank timestamp is dropped from the set after
+    times = {e.get("ts", "") for e in events}
+    times.discard("")
+    times = sorted(times)
 
     def to_secs(t):
         parts = t.split(":")
-        return int(parts[0]) * 3600 + int(parts[1]) * 60 + (int(parts[2]) if len(parts) > 2 else 0)
-
-    gaps = []
-    for i in range(1, len(times)):
         try:
-            gap = to_secs(times[i]) - to_secs(times[i - 1])
-            if gap > 120:  # >2 min
-                gaps.append((times[i - 1], times[i], gap))
-        except:
-            pass
+            return int(parts[0]) * 3600 + int(parts[1]) * 60 + (int(parts[2]) if len(parts) > 2 else 0)
+        except (ValueError, IndexError):
+            return None  # unparseable; gaps on either side of it are skipped
+
+    # Each timestamp is converted once, then neighbours are differenced
+    secs = [to_secs(t) for t in times]
+    gaps = [(prev_t, t, s - prev_s)
+            for prev_t, t, prev_s, s in zip(times, times[1:], secs, secs[1:])
+            if s is not None and prev_s is not None and s - prev_s > 120]  # >2 min
+
+    return heapq.nlargest(5, gaps, key=itemgetter(2))
 
-    gaps.sort(key=lambda x: -x[2])
-    return gaps[:5]
 
+CONCEPT_COMMAND_ACTIONS = frozenset({"command", "ran_command", "ran_tests", "built_project", "git_operation"})
+SPEC_DOC_RE = re.compile("spec|design|proposal|playbook")
 
 def extract_engineering_concepts(events):
     """Extract top engineering concepts/principles demonstrated in today's session."""
-    from collections import Counter
 
     concepts = []
 
-    # Gather data
-    delegated = [e for e in events if e.get("action") in ("delegated", "delegated_task")]
-    commands = [e for e in events if e.get("action") in ("command", "ran_command", "ran_tests",
-                                                          "built_project", "git_operation")]
-    research = [e for e in events if e.get("action") in ("research", "web_research")]
-    planned = [e for e in events if e.get("action") == "task_planned"]
-    completed = [e for e in events if e.get("action") == "task_completed"]
-    created = [e for e in events if e.get("action") == "created_file"]
-    git_ops = [c for c in commands if "git" in c.get("command", "").lower()]
-    test_ops = [c for c in commands if any(t in c.get("command", "").lower()
-                for t in ["test", "jest", "vitest", "pytest"])]
+    # Gather data in one pass; only the buckets inspected below are kept as lists
+    delegated, created = [], []
+    research = planned = completed = modified = 0
+    commits = branches = test_ops = 0
+    for e in events:
+        action = e.get("action")
+        if action in CONCEPT_COMMAND_ACTIONS:
+            cmd = e.get("command", "").lower()
+            if "git" in cmd:
+                if "commit" in cmd:
+                    commits += 1
+                if "checkout" in cmd or "branch" in cmd or "worktree" in cmd:
+                    branches += 1
+            if "test" in cmd or "jest" in cmd:  # 'test' also covers vitest and pytest
+                test_ops += 1
+        elif action == "modified_file":
+            modified += 1
+        elif action == "created_file":
+            created.append(e)
+        elif action in ("research", "web_research"):
+            research += 1
+        elif action == "task_planned":
+            planned += 1
+        elif action == "task_completed":
+            completed += 1
+        elif action in ("delegated", "delegated_task"):
+            delegated.append(e)
 
     # 1. Parallel Delegation pattern
     if len(delegated) >= 3:
@@ -1406,59 +1923,54 @@ def extract_engineering_concepts(events):
         })
 
     # 2. Research-before-build
-    if len(research) > 15 and len(created) > 5:
+    if research > 15 and len(created) > 5:
         concepts.append({
             "name": "Research-First Development",
             "principle": "Invest upfront in understanding the problem space before writing code",
-            "example": f"{len(research)} research events preceded {len(created)} files created — studied before building",
+            "example": f"{research} research events preceded {len(created)} files created — studied before building",
             "generalize": "For any unfamiliar domain: read docs → prototype → build. The research:code ratio should be at least 2:1 for novel problems.",
         })
 
     # 3. Task decomposition & completion
-    if len(planned) >= 5 and len(completed) >= 5:
-        ratio = len(completed) / max(len(planned), 1)
+    if planned >= 5 and completed >= 5:
+        ratio = completed / max(planned, 1)
         concepts.append({
             "name": "Structured Task Decomposition",
             "principle": "Break work into explicit, trackable tasks with clear completion criteria",
-            "example": f"Planned {len(planned)} tasks, completed {len(completed)} ({ratio:.0%} completion rate)",
+            "example": f"Planned {planned} tasks, completed {completed} ({ratio:.0%} completion rate)",
             "generalize": "Every project benefits from explicit task lists. The act of decomposing reveals hidden complexity and prevents scope creep.",
         })
 
     # 4. Iterative refinement
-    modified = [e for e in events if e.get("action") == "modified_file"]
-    if len(modified) > len(created) * 2 and len(modified) > 10:
+    if modified > len(created) * 2 and modified > 10:
         concepts.append({
             "name": "Iterative Refinement Over Perfection",
             "principle": "Ship a working version first, then refine through multiple passes",
-            "example": f"Created {len(created)} files but made {len(modified)} modifications — refined 2x+ per file on average",
+            "example": f"Created {len(created)} files but made {modified} modifications — refined 2x+ per file on average",
             "generalize": "First drafts are never final. Build the skeleton, then flesh it out. Applies to code, writing, design, and architecture.",
         })
 
     # 5. Git discipline
-    commits = [c for c in git_ops if "commit" in c.get("command", "").lower()]
-    branches = [c for c in git_ops if any(b in c.get("command", "").lower()
-                for b in ["checkout", "branch", "worktree"])]
-    if len(commits) >= 3 or len(branches) >= 2:
+    if commits >= 3 or branches >= 2:
         concepts.append({
             "name": "Version Control Discipline",
             "principle": "Commit frequently in logical units, use branches for isolation",
-            "example": f"{len(commits)} commits and {len(branches)} branch operations — kept changes atomic and reversible",
+            "example": f"{commits} commits and {branches} branch operations — kept changes atomic and reversible",
             "generalize": "Small, frequent commits > large monolithic ones. Each commit should be a complete, working state. Branch per feature, not per day.",
         })
 
     # 6. Test feedback loops
-    if len(test_ops) >= 3:
+    if test_ops >= 3:
         concepts.append({
             "name": "Tight Test Feedback Loops",
             "principle": "Run tests frequently to catch regressions early and build confidence",
-            "example": f"Ran {len(test_ops)} test cycles during the session — verified continuously, not just at the end",
+            "example": f"Ran {test_ops} test cycles during the session — verified continuously, not just at the end",
             "generalize": "Automated tests are your safety net. Run after every meaningful change. The cost of a late-caught bug is 10x the cost of early detection.",
         })
 
     # 7. Spec-driven development
-    spec_files = [e for e in created if any(s in e.get("file", "").lower()
-                  for s in ["spec", "design", "proposal", "playbook"])
-                  and e.get("file", "").lower().endswith(".md")]
+    spec_files = [e for e in created if e.get("file", "").lower().endswith(".md")
+                  and SPEC_DOC_RE.search(e.get("file", "").lower())]
     if len(spec_files) >= 2:
         concepts.append({
             "name": "Spec-Driven Development",
@@ -1484,13 +1996,13 @@ def render_session_insights(events):
             text = text[:117] + "..."
 
         output.append("")
-        output.append("┌" + "─" * 76 + "┐")
+        output.append(BOX_TOP)
         output.append("│" + " " * 19 + "💎 MOST EXPENSIVE PROMPT" + " " * 33 + "│")
-        output.append("└" + "─" * 76 + "┘")
-        output.append(f"")
+        output.append(BOX_BOTTOM)
+        output.append("")
         output.append(f"  Impact score: {score}  ({impact['files']} files × 3 + {impact['tasks']} tasks × 5 + {impact['commands']} cmds + {impact['delegated']} delegated × 4)")
         output.append(f"  📁 {prompt['project']}  ·  🕐 {prompt['time'][:5]}")
-        output.append(f"")
+        output.append("")
 
         # Word-wrap the prompt text
         words = text.split()
@@ -1517,28 +2029,26 @@ def render_session_insights(events):
 
     if slumps or gaps:
         output.append("")
-        output.append("┌" + "─" * 76 + "┐")
+        output.append(BOX_TOP)
         output.append("│" + " " * 23 + "📉 FRICTION & SLUMPS" + " " * 33 + "│")
-        output.append("└" + "─" * 76 + "┘")
+        output.append(BOX_BOTTOM)
 
     if slumps:
-        output.append(f"")
+        output.append("")
         output.append(f"  {len(slumps)} prompt(s) produced zero file/task output:")
         # Show top 5 most interesting slumps (longest prompts = most effort wasted)
-        sorted_slumps = sorted(slumps, key=lambda s: -len(s["text"]))[:5]
-        for s in sorted_slumps:
+        for s in heapq.nlargest(5, slumps, key=lambda s: len(s["text"])):
             text = " ".join(s["text"].split())
             if len(text) > 70:
                 text = text[:67] + "..."
             output.append(f"    {s['time'][:5]}  [{s['project']}] {text}")
 
         # Categorize the slumps
-        exploration = sum(1 for s in slumps if any(w in s["text"].lower()
-                         for w in ["check", "explore", "research", "what is", "how to", "tell me"]))
-        setup = sum(1 for s in slumps if any(w in s["text"].lower()
-                    for w in ["setup", "install", "configure", "open"]))
+        texts = [s["text"].lower() for s in slumps]
+        exploration = sum(1 for t in texts if SLUMP_EXPLORATION_RE.search(t))
+        setup = sum(1 for t in texts if SLUMP_SETUP_RE.search(t))
         other = len(slumps) - exploration - setup
-        output.append(f"")
+        output.append("")
         parts = []
         if exploration:
             parts.append(f"{exploration} exploration/research")
@@ -1547,11 +2057,11 @@ def render_session_insights(events):
         if other:
             parts.append(f"{other} other")
         output.append(f"  Breakdown: {' · '.join(parts)}")
-        output.append(f"  💡 Not all slumps are bad — exploration and research build understanding")
+        output.append("  💡 Not all slumps are bad — exploration and research build understanding")
 
     if gaps:
-        output.append(f"")
-        output.append(f"  Biggest pauses:")
+        output.append("")
+        output.append("  Biggest pauses:")
         for t1, t2, gap_secs in gaps[:3]:
             mins = gap_secs // 60
             output.append(f"    {t1[:5]} → {t2[:5]}  ({mins}m pause)")
@@ -1560,12 +2070,12 @@ def render_session_insights(events):
     concepts = extract_engineering_concepts(events)
     if concepts:
         output.append("")
-        output.append("┌" + "─" * 76 + "┐")
+        output.append(BOX_TOP)
         output.append("│" + " " * 16 + "🧬 TOP ENGINEERING PRINCIPLES APPLIED" + " " * 23 + "│")
-        output.append("└" + "─" * 76 + "┘")
+        output.append(BOX_BOTTOM)
 
         for i, c in enumerate(concepts, 1):
-            output.append(f"")
+            output.append("")
             output.append(f"  {i}. {c['name']}")
             output.append(f"     PRINCIPLE: {c['principle']}")
             output.append(f"     TODAY:     {c['example']}")
@@ -1582,7 +2092,7 @@ def render_session_insights(events):
             if current.strip():
                 output.append(current)
 
-    return "\n".join(output)
+    return output
 
 
 def render_week_slim(days=7):
@@ -1590,26 +2100,21 @@ def render_week_slim(days=7):
     lines = []
     today = datetime.now()
 
-    week_data = []
-    for i in range(days - 1, -1, -1):
-        day = today - timedelta(days=i)
-        date_str = day.strftime("%Y-%m-%d")
-        day_name = day.strftime("%a")
-        events = load_logs(date_str)
-
-        meaningful = [e for e in events if e.get("action") in
-                     ("created_file", "modified_file", "committed_code", "ran_tests", "built_project")]
-        week_data.append((day_name, date_str, len(meaningful), len(events)))
+    week = [today - timedelta(days=i) for i in range(days - 1, -1, -1)]
+    date_strs = [day.strftime("%Y-%m-%d") for day in week]
+    week_data = [(day.strftime("%a"), date_str, meaningful, total)
+                 for day, date_str, (meaningful, total) in zip(week, date_strs, count_days(date_strs))]
 
     max_events = max(d[2] for d in week_data) if week_data else 1
+    today_str = today.strftime("%Y-%m-%d")
 
     for day_name, date_str, meaningful, total in week_data:
         if meaningful == 0 and total == 0:
             continue  # Skip empty days
         bar_len = int((meaningful / max(max_events, 1)) * 20)
-        bar = "█" * bar_len + "░" * (20 - bar_len)
+        bar = BAR_FULL[:bar_len] + BAR_EMPTY[:20 - bar_len]
 
-        is_today = date_str == today.strftime("%Y-%m-%d")
+        is_today = date_str == today_str
         marker = "→" if is_today else " "
 
         lines.append(f"  {marker} {day_name} │{bar}│ {meaningful:3}")
@@ -1628,26 +2133,26 @@ def render_week_slim(days=7):
     return "\n".join(lines)
 
 
-def render_journal(events, date_str):
-    """Generate a dev-first journal — product-focused, scannable, vibes-aware."""
+def render_journal(events, date_str, project=None):
+    """Generate a dev-first journal — product-focused, scannable, vibes-aware.
+
+    With `project`, `events` are that project's; the cost and the week chart
+    are day totals across all projects and are labelled as such.
+    """
     output = []
 
     if not events:
-        date_display = datetime.strptime(date_str, "%Y-%m-%d").strftime("%a %b %d")
+        date_display = parse_day(date_str).strftime("%a %b %d")
         output.append(f"\n  cc — {date_display} · no activity\n")
         return "\n".join(output)
 
-    projects = analyze_events(events)
+    projects, totals = analyze_events(events)
 
     # ── Header: one line ──
-    all_times = []
-    for p in projects.values():
-        all_times.extend(p["timeline"])
-    duration = get_duration_str(all_times) or "0m"
-    date_display = datetime.strptime(date_str, "%Y-%m-%d").strftime("%a %b %d")
+    duration = get_duration_str(totals) or "0m"
+    date_display = parse_day(date_str).strftime("%a %b %d")
 
-    active_count = sum(1 for p in projects.values()
-                       if p["files_created"] or p["files_modified"] or p.get("plans"))
+    active_count = totals.active_projects
 
     # Get cost for header
     stats = load_usage_stats()
@@ -1656,6 +2161,8 @@ def render_journal(events, date_str):
         by_date = stats.get("by_date", {})
         if date_str in by_date:
             cost_str = f" · ${by_date[date_str]['cost']:.0f}"
+            if project:
+                cost_str += " all projects"
 
     output.append("")
     output.append(f"  cc — {date_display} · {duration} · {active_count} projects{cost_str}")
@@ -1667,8 +2174,8 @@ def render_journal(events, date_str):
     expanded, collapsed = rank_projects(projects)
 
     for name, data in expanded:
-        time_range, start_t, end_t = get_time_range_short(data["timeline"])
-        proj_duration = get_duration_str(data["timeline"])
+        time_range, start_t, end_t = get_time_range_short(data)
+        proj_duration = get_duration_str(data)
 
         # Project name + time range
         name_display = name[:38]
@@ -1680,7 +2187,7 @@ def render_journal(events, date_str):
         output.append(f"  {name_display}{' ' * padding}{time_display}")
 
         # Branch indicator
-        branches = data.get("branches", set())
+        branches = data.branches
         if branches:
             branch_str = ", ".join(branches)
             output.append(f"  [{branch_str}]")
@@ -1719,7 +2226,7 @@ def render_journal(events, date_str):
         output.append(f"  + {len(collapsed)} smaller sessions ({names_str})")
 
     # ── VIBES ──
-    vibes = compute_vibes(projects, events, date_str)
+    vibes = compute_vibes(projects, totals, events, date_str, project)
 
     output.append("")
     output.append(f"  VIBES {'═' * 47}")
@@ -1732,7 +2239,10 @@ def render_journal(events, date_str):
 
     # ── WEEK ──
     output.append("")
-    output.append(f"  WEEK {'═' * 48}")
+    if project:
+        output.append(f"  WEEK · all projects {'═' * 33}")
+    else:
+        output.append(f"  WEEK {'═' * 48}")
     output.append("")
     output.append(render_week_slim())
 
@@ -1740,14 +2250,14 @@ def render_journal(events, date_str):
     return "\n".join(output)
 
 
-def render_full_summary(events, date_str):
+def render_full_summary(events, date_str, project=None):
     output = []
 
     # Header
     output.append(HEADER)
 
     # Date
-    date_display = datetime.strptime(date_str, "%Y-%m-%d").strftime("%A, %B %d, %Y")
+    date_display = parse_day(date_str).strftime("%A, %B %d, %Y")
     output.append(f"  📆 {date_display}")
     output.append(f"  🕐 Generated at {datetime.now().strftime('%H:%M')}")
 
@@ -1761,27 +2271,28 @@ def render_full_summary(events, date_str):
         return "\n".join(output)
 
     # Analyze
-    projects = analyze_events(events)
+    projects, totals = analyze_events(events)
 
-    # Day narrative
-    output.append(render_day_narrative(projects, date_str))
+    # Day narrative. Each section hands back its lines, so the whole
+    # report is joined once below
+    output.extend(render_day_narrative(projects, totals, date_str))
 
     # Per-project summaries — skip projects with minimal activity
-    for name, data in sorted(projects.items(), key=lambda x: -len(x[1]["timeline"])):
-        has_substance = (data["files_created"] or data["files_modified"]
-                        or data.get("plans") or data.get("user_intents")
-                        or data.get("completion_count", 0) > 0)
-        if data["timeline"] and has_substance:
-            output.append(render_project_summary(name, data))
+    for name, data in projects_by_activity(projects):
+        has_substance = (data.files_created or data.files_modified
+                        or data.plans or data.user_intents
+                        or data.completion_count > 0)
+        if data.event_count and has_substance:
+            output.extend(render_project_summary(name, data))
 
     # Top prompts analysis
-    output.append(render_top_prompts(events))
+    output.extend(render_top_prompts(events))
 
     # Session insights: most expensive prompt, slumps, engineering concepts
-    output.append(render_session_insights(events))
+    output.extend(render_session_insights(events))
 
     # Week view
-    output.append(render_week_activity())
+    output.extend(render_week_activity(all_projects=project is not None))
 
     # Footer
     output.append("")
@@ -1833,41 +2344,48 @@ def parse_relative_range(relative_str):
         raise ValueError(f"Unknown relative range: {relative_str}")
 
 
-def load_date_range(start_date, end_date):
-    """Load all events in a date range."""
+def load_date_range(start_date, end_date, project=None):
+    """Load all events in a date range.
+
+    Returns (events, day_counts): day_counts maps each date that had events,
+    in order, to how many of them it contributed.
+    """
     all_events = []
 
-    start = datetime.strptime(start_date, "%Y-%m-%d")
-    end = datetime.strptime(end_date, "%Y-%m-%d")
+    start = parse_day(start_date)
+    end = parse_day(end_date)
 
     current = start
-    dates_loaded = []
+    day_counts = {}
 
     while current <= end:
         date_str = current.strftime("%Y-%m-%d")
-        events = load_logs(date_str)
-        if events:
-            all_events.extend(events)
-            dates_loaded.append(date_str)
+        loaded = len(all_events)
+        all_events.extend(iter_logs(date_str, project))
+        if len(all_events) > loaded:
+            day_counts[date_str] = len(all_events) - loaded
         current += timedelta(days=1)
 
-    return all_events, dates_loaded
+    return all_events, day_counts
 
 
-def render_range_summary(start_date, end_date):
+COMMAND_ICONS = {"ran_tests": "🧪", "built_project": "🔨", "committed_code": "💾"}
+
+def render_range_summary(start_date, end_date, project=None):
     """Generate a summary for a date range."""
     output = []
 
     # Load all events in range
-    all_events, dates_loaded = load_date_range(start_date, end_date)
+    all_events, day_counts = load_date_range(start_date, end_date, project)
+    dates_loaded = list(day_counts)
 
     if not all_events:
         output.append(f"\n  ⚠️  No activity logged between {start_date} and {end_date}\n")
         return "\n".join(output)
 
     # Calculate span
-    start_dt = datetime.strptime(start_date, "%Y-%m-%d")
-    end_dt = datetime.strptime(end_date, "%Y-%m-%d")
+    start_dt = parse_day(start_date)
+    end_dt = parse_day(end_date)
     days_span = (end_dt - start_dt).days + 1
 
     # Format header
@@ -1875,14 +2393,22 @@ def render_range_summary(start_date, end_date):
     end_display = end_dt.strftime("%b %d, %Y")
 
     output.append("")
-    output.append("┌" + "─" * 76 + "┐")
+    output.append(BOX_TOP)
     title = f"📊 WORK SUMMARY: {start_display.upper()} → {end_display.upper()} ({days_span} DAYS)"
     padding = (78 - len(title)) // 2
     output.append("│" + " " * padding + title + " " * (78 - padding - len(title)) + "│")
-    output.append("├" + "─" * 76 + "┤")
+    output.append(BOX_MID)
 
     # Analyze all events
-    projects = analyze_events(all_events)
+    projects, _ = analyze_events(all_events)
+
+    # Days each project was active: the range is loaded day by day, so each
+    # date's events are the next day_counts[date] entries of all_events
+    project_days = Counter()
+    offset = 0
+    for count in day_counts.values():
+        project_days.update({e.get("project", "unknown") for e in all_events[offset:offset + count]})
+        offset += count
 
     # Overall stats
     total_projects = len(projects)
@@ -1892,41 +2418,43 @@ def render_range_summary(start_date, end_date):
     stats = f"│  {total_projects} project(s)  •  {days_active} days active  •  {total_sessions} sessions"
     stats = stats + " " * (77 - len(stats)) + "│"
     output.append(stats)
-    output.append("└" + "─" * 76 + "┘")
+    output.append(BOX_BOTTOM)
 
     # Per-project summaries
-    for name, data in sorted(projects.items(), key=lambda x: -len(x[1]["timeline"])):
-        if not data["timeline"]:
+    for name, data in projects_by_activity(projects):
+        if not data.event_count:
             continue
 
         output.append("")
-        output.append(f"  📁 {name:<60} [{len(set([t[:10] for t in data['timeline']]))} days active]")
+        output.append(f"  📁 {name:<60} [{project_days[name]} days active]")
 
         # Show work done (adapt to backfilled vs detailed)
-        if data.get("has_backfill"):
-            prompts = data["prompts"]
+        if data.has_backfill:
+            prompts = data.prompts
             if prompts and len(prompts) <= 5:
                 for p in prompts[:5]:
-                    prompt_text = p["prompt"][:60] + "..." if len(p["prompt"]) > 60 else p["prompt"]
+                    prompt_text = p["prompt"]
+                    if len(prompt_text) > 60:
+                        prompt_text = f"{prompt_text[:60]}..."
                     if prompt_text:
                         output.append(f"      📝 {prompt_text}")
             elif prompts:
                 output.append(f"      📝 {len(prompts)} sessions")
         else:
             # Detailed stats
-            if data["files_created"]:
-                output.append(f"      🏗️  Created {len(data['files_created'])} files")
-            if data["files_modified"]:
-                unique_modified = len(set(f["file"] for f in data["files_modified"]))
+            if data.files_created:
+                output.append(f"      🏗️  Created {len(data.files_created)} files")
+            if data.files_modified:
+                unique_modified = len(set(f["file"] for f in data.files_modified))
                 output.append(f"      ✏️  Modified {unique_modified} files")
-            if data["commands"]:
+            if data.commands:
                 # Group commands by type
                 cmd_types = defaultdict(int)
-                for c in data["commands"]:
+                for c in data.commands:
                     cmd_types[c["action"]] += 1
 
                 for action, count in cmd_types.items():
-                    icon = {"ran_tests": "🧪", "built_project": "🔨", "committed_code": "💾"}.get(action, "▶️")
+                    icon = COMMAND_ICONS.get(action, "▶️")
                     label = action.replace("_", " ").title()
                     output.append(f"      {icon} {label} ({count}x)")
 
@@ -1935,29 +2463,19 @@ def render_range_summary(start_date, end_date):
         output.append("")
         output.append("  Daily breakdown:")
 
-        # Count events per date
-        events_by_date = defaultdict(int)
-        for e in all_events:
-            # Extract date from various timestamp formats
-            ts = e.get("ts", "")
-            if ts and len(ts) >= 5:  # HH:MM format
-                # We need to track which log file this came from
-                # For now, count all events
-                pass
-
-        # Load each date individually for accurate counts
+        # Counted while the range was loaded, so no day is read twice
+        max_count = max(day_counts.values())
+
         for date_str in dates_loaded[:10]:  # Show max 10 days
-            events = load_logs(date_str)
-            count = len(events)
+            count = day_counts[date_str]
 
             # Format date
-            dt = datetime.strptime(date_str, "%Y-%m-%d")
+            dt = parse_day(date_str)
             date_display = dt.strftime("%b %d")
 
             # Activity bar
-            max_count = max(len(load_logs(d)) for d in dates_loaded)
             bar_len = int((count / max(max_count, 1)) * 20)
-            bar = "█" * bar_len + "░" * (20 - bar_len)
+            bar = BAR_FULL[:bar_len] + BAR_EMPTY[:20 - bar_len]
 
             output.append(f"    {date_display} │{bar}│ {count:3} sessions")
 
@@ -1975,38 +2493,38 @@ def render_compact_summary(events, date_str):
     """Generate a compact quick-glance summary."""
     output = []
 
-    date_display = datetime.strptime(date_str, "%Y-%m-%d").strftime("%a %b %d")
+    date_display = parse_day(date_str).strftime("%a %b %d")
 
     if not events:
         output.append(f"📊 {date_display} — No activity logged")
         return "\n".join(output)
 
-    projects = analyze_events(events)
+    projects, totals = analyze_events(events)
 
-    total_created = sum(len(p["files_created"]) for p in projects.values())
-    total_modified = sum(len(p["files_modified"]) for p in projects.values())
-    total_completed = sum(len(set(p["tasks_completed"])) for p in projects.values())
+    total_created = totals.files_created
+    total_modified = totals.files_modified
+    total_completed = totals.tasks_completed
 
     # Header line
     output.append(f"📊 {date_display} — {len(projects)} project(s) | {total_created} created | {total_modified} modified | {total_completed} tasks")
     output.append("")
 
     # Per-project one-liners
-    for name, data in sorted(projects.items(), key=lambda x: -len(x[1]["timeline"])):
-        if not data["timeline"]:
+    for name, data in projects_by_activity(projects):
+        if not data.event_count:
             continue
 
-        start = min(data["timeline"])
-        end = max(data["timeline"])
+        start = data.first_ts
+        end = data.last_ts
 
         # Build a brief description
         parts = []
-        if data["files_created"]:
-            parts.append(f"{len(data['files_created'])} files")
-        if data["tasks_completed"]:
-            parts.append(f"{len(set(data['tasks_completed']))} tasks")
-        if data["commands"]:
-            cmd_types = set(c["action"] for c in data["commands"])
+        if data.files_created:
+            parts.append(f"{len(data.files_created)} files")
+        if data.tasks_completed:
+            parts.append(f"{len(data.tasks_completed)} tasks")
+        if data.commands:
+            cmd_types = set(c["action"] for c in data.commands)
             if "ran_tests" in cmd_types:
                 parts.append("tests")
             if "built_project" in cmd_types:
@@ -2026,39 +2544,42 @@ def render_date_picker():
         print("\n  ⚠️  No logs found. Start coding with Claude Code to generate activity logs!\n")
         return None
 
-    print("\n  📅 Available Engineering Journals\n")
-    print("  ─" * 38)
+    # Render the list into one buffer and write it once, prompt included
+    out = []
+    emit = out.append
 
-    for i, date_str in enumerate(dates[:15], 1):
-        events = load_logs(date_str)
-        if not events:
-            continue
+    emit("\n  📅 Available Engineering Journals\n")
+    emit("  ─" * 38)
 
-        projects = analyze_events(events)
-        total_created = sum(len(p["files_created"]) for p in projects.values())
-        total_modified = sum(len(p["files_modified"]) for p in projects.values())
-        total_tasks = sum(len(set(p["tasks_completed"])) for p in projects.values())
+    today_str = datetime.now().strftime("%Y-%m-%d")
+    overviews = day_overviews(dates[:15])
+    for i, (date_str, overview) in enumerate(zip(dates, overviews), 1):
+        projects, total_created, total_modified, total_tasks = overview
+        if not projects:
+            continue
 
-        date_display = datetime.strptime(date_str, "%Y-%m-%d").strftime("%a %b %d")
-        project_names = ", ".join(list(projects.keys())[:3])
+        date_display = parse_day(date_str).strftime("%a %b %d")
+        project_names = ", ".join(projects[:3])
         if len(projects) > 3:
             project_names += f" +{len(projects)-3}"
 
         # Highlight today
-        is_today = date_str == datetime.now().strftime("%Y-%m-%d")
+        is_today = date_str == today_str
         marker = "→" if is_today else " "
         today_label = " (today)" if is_today else ""
 
-        print(f"  {marker} [{i:2}] {date_display}{today_label}")
-        print(f"        {len(projects)} project(s) | {total_created} created | {total_modified} modified | {total_tasks} tasks")
-        print(f"        {project_names}")
-        print()
+        emit(f"  {marker} [{i:2}] {date_display}{today_label}")
+        emit(f"        {len(projects)} project(s) | {total_created} created | {total_modified} modified | {total_tasks} tasks")
+        emit(f"        {project_names}")
+        emit("")
 
     if len(dates) > 15:
-        print(f"       ... and {len(dates) - 15} more dates (use --list to see all)\n")
+        emit(f"       ... and {len(dates) - 15} more dates (use --list to see all)\n")
 
-    print("  ─" * 38)
-    print("  Enter number to expand, or press Enter for today: ", end="")
+    emit("  ─" * 38)
+    emit("  Enter number to expand, or press Enter for today: ")
+    sys.stdout.write("\n".join(out))
+    sys.stdout.flush()
 
     try:
         choice = input().strip()
@@ -2076,11 +2597,37 @@ def render_date_picker():
         return None
 
 
+def journal_is_saved(save_path, date_str):
+    """Whether the saved journal at save_path is still what rendering it would give.
+
+    Besides the day's log, the journal shows the day's cost from the usage
+    stats and a week chart counted back from today, so the save must be from
+    today and newer than all of those files. --full is never reprinted: it
+    stamps the time it was generated.
+    """
+    try:
+        saved = save_path.stat().st_mtime
+        sources = [(LOGS_DIR / f"{date_str}.jsonl").stat().st_mtime]
+    except OSError:
+        return False
+    if datetime.fromtimestamp(saved).date() != datetime.now().date():
+        return False
+    today = datetime.now()
+    week = [LOGS_DIR / f"{(today - timedelta(days=i)).strftime('%Y-%m-%d')}.jsonl" for i in range(7)]
+    for path in [STATS_FILE, *week]:
+        try:
+            sources.append(path.stat().st_mtime)
+        except OSError:
+            pass
+    return saved >= max(sources)
+
+
 def main():
     parser = argparse.ArgumentParser(description="Claude Code Engineering Journal")
     parser.add_argument("--date", "-d", help="Date to summarize (YYYY-MM-DD)")
     parser.add_argument("--list", "-l", action="store_true", help="List available dates")
-    parser.add_argument("--save", "-s", action="store_true", help="Save summary to file")
+    parser.add_argument("--save", "-s", action="store_true", help="Save summary to summaries/<date>-journal.txt (-full.txt with --full)")
+    parser.add_argument("--force", action="store_true", help="With --save, re-render even if the saved summary is up to date")
     parser.add_argument("--raw", "-r", action="store_true", help="Show raw log data")
     parser.add_argument("--compact", "-c", action="store_true", help="Compact quick-glance view")
     parser.add_argument("--full", "-f", action="store_true", help="Full verbose output (old style)")
@@ -2089,6 +2636,7 @@ def main():
     parser.add_argument("--range", nargs=2, metavar=("START", "END"), help="Date range (YYYY-MM-DD YYYY-MM-DD)")
     parser.add_argument("--range-relative", help="Relative range (7d, this-week, last-month)")
     parser.add_argument("--prompt", "-P", type=str, help="Expand a top prompt by rank (1-5) or 'all'")
+    parser.add_argument("--project", help="Only include events from this project")
 
     args = parser.parse_args()
 
@@ -2098,10 +2646,10 @@ def main():
     if args.list:
         dates = get_available_dates()
         print("\n  📅 Available engineering journals:\n")
-        for d in dates:
-            events = load_logs(d)
-            projects = len(set(e.get("project", "") for e in events if e.get("project")))
-            print(f"    {d}: {len(events)} events across {projects} project(s)")
+        # Reading the logs is I/O-bound; overlap it across threads and print in order
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            for d, (count, projects) in zip(dates, pool.map(summarize_log, dates)):
+                print(f"    {d}: {count} events across {projects} project(s)")
         print()
         return
 
@@ -2126,28 +2674,29 @@ def main():
         if not dates:
             print("\n  No logs found yet.\n")
             return
-        print("\n  📅 Available Engineering Journals\n")
-        for i, date_str in enumerate(dates[:15], 1):
-            events = load_logs(date_str)
-            if not events:
+        out = []
+        emit = out.append
+        emit("\n  📅 Available Engineering Journals\n")
+        today_str = datetime.now().strftime("%Y-%m-%d")
+        overviews = day_overviews(dates[:15])
+        for i, (date_str, overview) in enumerate(zip(dates, overviews), 1):
+            projects, total_created, total_modified, total_tasks = overview
+            if not projects:
                 continue
-            projects = analyze_events(events)
-            total_created = sum(len(p["files_created"]) for p in projects.values())
-            total_modified = sum(len(p["files_modified"]) for p in projects.values())
-            total_tasks = sum(len(set(p["tasks_completed"])) for p in projects.values())
-            date_display = datetime.strptime(date_str, "%Y-%m-%d").strftime("%a %b %d")
-            project_names = ", ".join(list(projects.keys())[:3])
+            date_display = parse_day(date_str).strftime("%a %b %d")
+            project_names = ", ".join(projects[:3])
             if len(projects) > 3:
                 project_names += f" +{len(projects)-3}"
-            is_today = date_str == datetime.now().strftime("%Y-%m-%d")
+            is_today = date_str == today_str
             marker = "→" if is_today else " "
             today_label = " (today)" if is_today else ""
-            print(f"  {marker} [{i:2}] {date_str} — {date_display}{today_label}")
-            print(f"        {len(projects)} project(s) | {total_created} created | {total_modified} modified | {total_tasks} tasks")
-            print(f"        {project_names}")
-            print()
+            emit(f"  {marker} [{i:2}] {date_str} — {date_display}{today_label}")
+            emit(f"        {len(projects)} project(s) | {total_created} created | {total_modified} modified | {total_tasks} tasks")
+            emit(f"        {project_names}")
+            emit("")
         if len(dates) > 15:
-            print(f"       ... and {len(dates) - 15} more dates\n")
+            emit(f"       ... and {len(dates) - 15} more dates\n")
+        sys.stdout.write("\n".join(out) + "\n")
         return
 
     # Date range summary
@@ -2161,41 +2710,60 @@ def main():
         else:
             start_date, end_date = args.range
 
-        print(render_range_summary(start_date, end_date))
-        print(render_usage_stats(start_date=start_date, end_date=end_date))
+        print(render_range_summary(start_date, end_date, args.project))
+        print(render_usage_stats(start_date=start_date, end_date=end_date,
+                                 all_projects=args.project is not None))
         return
 
     date_str = args.date or datetime.now().strftime("%Y-%m-%d")
-    events = load_logs(date_str)
+
+    # A saved journal newer than everything it was rendered from is still
+    # current: reprint it instead of parsing and rendering the day again.
+    # auto_sync_native_logs() has returned by now, so the logs and stats
+    # checked are the synced ones. The default view keeps the original
+    # <date>-journal.txt name; --full and --project get their own files
+    save_name = f"{date_str}-{'full' if args.full else 'journal'}"
+    if args.project:
+        # Project names can contain path separators; keep the file in SUMMARIES_DIR
+        save_name += "-" + args.project.replace("/", "_").replace(os.sep, "_")
+    save_path = SUMMARIES_DIR / f"{save_name}.txt"
+    if args.save and not (args.force or args.prompt or args.raw or args.compact or args.full):
+        if journal_is_saved(save_path, date_str):
+            print(save_path.read_text(encoding="utf-8"))
+            print(f"  💾 Unchanged since last save: {save_path}")
+            return
+
+    # Raw dump of the last events; only those are decoded
+    if args.raw and not args.prompt:
+        for e in tail_logs(date_str, 20, args.project):
+            print(json.dumps(e, indent=2))
+        return
+
+    events = load_logs(date_str, args.project)
 
     # Prompt deep dive
     if args.prompt:
         print(render_prompt_detail(events, args.prompt))
         return
 
-    if args.raw:
-        for e in events[-20:]:
-            print(json.dumps(e, indent=2))
-        return
-
     if args.compact:
         print(render_compact_summary(events, date_str))
-        print(render_usage_stats(date_str))
+        print(render_usage_stats(date_str, all_projects=args.project is not None))
         return
 
     if args.full:
-        summary = render_full_summary(events, date_str)
+        summary = render_full_summary(events, date_str, args.project)
         print(summary)
-        print(render_usage_stats(date_str))
+        print(render_usage_stats(date_str, all_projects=args.project is not None))
     else:
-        summary = render_journal(events, date_str)
+        summary = render_journal(events, date_str, args.project)
         print(summary)
 
     if args.save:
         SUMMARIES_DIR.mkdir(exist_ok=True)
-        save_path = SUMMARIES_DIR / f"{date_str}-journal.txt"
-        with open(save_path, "w") as f:
-            f.write(summary)
+        # The rendered text already exists for stdout; write that same string
+        # once, as UTF-8 so the emoji survive non-UTF-8 locales
+        save_path.write_text(summary, encoding="utf-8")
         print(f"  💾 Saved to: {save_path}")
 
 if __name__ == "__main__":
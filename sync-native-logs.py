@@ -26,6 +26,16 @@ from datetime import datetime
 from pathlib import Path
 from collections import defaultdict
 
+try:
+    import orjson
+    json_loads = orjson.loads
+    json_dumps = orjson.dumps
+except ImportError:  # orjson is optional; the stdlib keeps the scripts zero-setup
+    json_loads = json.loads
+
+    def json_dumps(obj):
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode()
+
 # Paths
 CLAUDE_DIR = Path.home() / ".claude"
 PROJECTS_DIR = CLAUDE_DIR / "projects"
@@ -151,25 +161,30 @@ def load_sync_state() -> dict:
     """Load sync state (tracks last processed position per file)."""
     if STATE_FILE.exists():
         try:
-            with open(STATE_FILE) as f:
-                return json.load(f)
+            return json_loads(STATE_FILE.read_bytes())
         except:
             pass
     return {"files": {}, "sessions": {}}
 
 
+def write_json_atomic(path: Path, obj):
+    """Write obj as indented JSON via a temp file, so readers never see a partial file."""
+    tmp_file = path.with_suffix(".tmp")
+    with open(tmp_file, 'w') as f:
+        json.dump(obj, f, indent=2)
+    os.replace(tmp_file, path)
+
+
 def save_sync_state(state: dict):
     """Save sync state."""
-    with open(STATE_FILE, 'w') as f:
-        json.dump(state, f, indent=2)
+    write_json_atomic(STATE_FILE, state)
 
 
 def load_stats() -> dict:
     """Load cumulative stats."""
     if STATS_FILE.exists():
         try:
-            with open(STATS_FILE) as f:
-                return json.load(f)
+            return json_loads(STATS_FILE.read_bytes())
         except:
             pass
     return {
@@ -185,8 +200,7 @@ def load_stats() -> dict:
 
 def save_stats(stats: dict):
     """Save cumulative stats."""
-    with open(STATS_FILE, 'w') as f:
-        json.dump(stats, f, indent=2)
+    write_json_atomic(STATS_FILE, stats)
 
 
 def find_all_log_files() -> list[Path]:
@@ -205,13 +219,13 @@ def parse_native_log(log_file: Path, start_pos: int = 0) -> tuple[list[dict], li
     token_records = []
 
     try:
-        with open(log_file, 'r') as f:
+        with open(log_file, 'rb') as f:
             f.seek(start_pos)
             for line in f:
                 if not line.strip():
                     continue
                 try:
-                    data = json.loads(line)
+                    data = json_loads(line)
                     parsed_events, parsed_tokens = parse_log_entry(data)
                     events.extend(parsed_events)
                     if parsed_tokens:
@@ -418,9 +432,9 @@ def write_events_by_date(events: list[dict]):
 
     for date, date_events in by_date.items():
         log_file = LOGS_DIR / f"{date}.jsonl"
-        with open(log_file, 'a') as f:
+        with open(log_file, 'ab') as f:
             for event in date_events:
-                f.write(json.dumps(event) + '\n')
+                f.write(json_dumps(event) + b'\n')
 
     return dict(by_date)
 
@@ -671,8 +685,6 @@ def main():
                         help='Show token/cost stats. Optional: 7d, 30d, last-month, this-month, or YYYY-MM-DD')
     args = parser.parse_args()
 
-    log = lambda *a: None if args.quiet else print(*a)
-
     # Stats only mode
     if args.stats is not None:
         stats = load_stats()
@@ -680,11 +692,21 @@ def main():
         show_stats(stats, range_arg)
         return
 
+    sync(reset=args.reset, quiet=args.quiet)
+
+
+def sync(reset=False, quiet=False):
+    """Sync new native log entries into daily logs and usage stats.
+
+    Also called in-process by summary.py, which imports this script.
+    """
+    log = lambda *a: None if quiet else print(*a)
+
     log("🔄 Claude Code Native Log Sync v2")
     log("=" * 50)
 
     # Load or reset state
-    if args.reset:
+    if reset:
         state = {"files": {}, "sessions": {}}
         stats = {
             "total_tokens": {"input": 0, "output": 0, "cache_read": 0, "cache_write": 0},
@@ -0,0 +1,75 @@
+"""
+Raw-byte log counts in summary.py against counts from decoded events.
+Run with: python3 -m unittest discover tests
+"""
+
+import importlib.util
+import tempfile
+import unittest
+from pathlib import Path
+
+SUMMARY = Path(__file__).resolve().parent.parent / "summary.py"
+
+DATE = "2026-01-01"
+
+LOG_LINES = [
+    # Plain events, in the compact and the older spaced format
+    '{"ts":"2026-01-01T09:00:00","action":"created_file","project":"api"}',
+    '{"ts": "2026-01-01T09:05:00", "action": "prompt", "project": "web"}',
+    '{"ts":"2026-01-01T09:10:00","action":"ran_tests","project":"caf\\u00e9"}',
+    '{"ts":"2026-01-01T09:11:00","action":"modified_file","project":"café"}',
+    # Nested keys that belong to a payload, not the event
+    '{"ts":"2026-01-01T09:20:00","payload":{"action":"created_file","project":"ghost"}}',
+    '{"ts":"2026-01-01T09:21:00","payload":{"action":"committed_code"},"action":"prompt","project":"api"}',
+    '{"ts":"2026-01-01T09:22:00","action":"built_project","payload":{"project":"ghost2"}}',
+    # Keys quoted inside string values
+    '{"ts":"2026-01-01T09:30:00","prompt":"set \\"action\\": \\"created_file\\" {","action":"prompt"}',
+    '{"ts":"2026-01-01T09:31:00","prompt":"{","action":"committed_code","project":"q\\"x"}',
+    # Malformed lines the decoder rejects
+    '{"ts":"2026-01-01T09:40:00","action":"created_file",}',
+    '{"ts":"2026-01-01T09:41:00","payload":{"action":"created_file","project":"lost"}',
+    '{"ts":"2026-01-01T09:42:00","action":"ran_tes',
+    '[1, 2]',
+    '   ',
+    # Unterminated last line, as a writer mid-append leaves it
+    '{"ts":"2026-01-01T09:50:00","action":"created_file","project":"pend',
+]
+
+
+def load_summary(logs_dir):
+    spec = importlib.util.spec_from_file_location("summary", SUMMARY)
+    summary = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(summary)
+    summary.LOGS_DIR = logs_dir
+    summary.COUNTS_INDEX = summary.LogIndex(logs_dir / ".counts.json")
+    return summary
+
+
+class LogCountsTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        logs_dir = Path(self.tmp.name)
+        (logs_dir / f"{DATE}.jsonl").write_text("\n".join(LOG_LINES), encoding="utf-8")
+        self.summary = load_summary(logs_dir)
+        self.events = [e for e in self.summary.load_logs(DATE) if isinstance(e, dict)]
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_count_log_events_matches_load_logs(self):
+        meaningful = sum(e.get("action") in self.summary.MEANINGFUL_ACTIONS for e in self.events)
+        self.assertEqual(self.summary.count_log_events(DATE), (meaningful, len(self.events)))
+
+    def test_summarize_log_matches_load_logs(self):
+        projects = {e["project"] for e in self.events if e.get("project")}
+        self.assertEqual(self.summary.summarize_log(DATE), (len(self.events), len(projects)))
+
+    def test_counts_index_round_trip(self):
+        first = self.summary.count_log_events(DATE)
+        self.summary.COUNTS_INDEX.save()
+        self.summary.COUNTS_INDEX = self.summary.LogIndex(self.summary.COUNTS_INDEX.path)
+        self.assertEqual(self.summary.count_log_events(DATE), first)
+
+
+if __name__ == "__main__":
+    unittest.main()